@@ -3,12 +3,16 @@ Configuration for Chloros Blog MCP Server.
 """
 
 import os
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from typing import Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """Application settings from environment variables."""
     
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
+    
     # API Keys
     openai_api_key: str
     openrouter_api_key: str
@@ -16,11 +20,15 @@ class Settings(BaseSettings):
     pinecone_api_key: str
     pinecone_environment: str
     pinecone_index_name: str = "medical"
+    # Data-plane host from the Pinecone console; skips the describe_index lookup at startup
+    pinecone_index_host: Optional[str] = None
+    pinecone_top_k: int = 25
     
-    # Google Configuration
-    google_client_id: str
-    google_client_secret: str
-    google_refresh_token: str
+    # Google Configuration (service account JSON, or OAuth client + refresh token)
+    google_service_account_json: Optional[str] = None
+    google_client_id: Optional[str] = None
+    google_client_secret: Optional[str] = None
+    google_refresh_token: Optional[str] = None
     google_sheets_id: str
     google_published_folder_id: str
     
@@ -33,14 +41,22 @@ class Settings(BaseSettings):
     openai_embedding_model: str = "text-embedding-3-small"
     embedding_dimensions: int = 512
     
+    # Concurrency limits per provider (in-flight requests)
+    openai_max_concurrency: int = 10
+    openrouter_max_concurrency: int = 5
+    perplexity_max_concurrency: int = 5
+    pinecone_max_concurrency: int = 20
+    
+    # How often blog patterns are reloaded from Google Sheets in the background
+    patterns_refresh_seconds: int = 300
+    
     # Quality Configuration
     quality_pass_threshold: int = 80
     word_count_fail_threshold: float = -0.15
     max_retries: int = 3
-    
-    class Config:
-        env_file = ".env"
 
 
-# Global settings instance
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, parsing the environment only once."""
+    return Settings()
@@ -2,51 +2,180 @@
 Simple health check for Railway deployment.
 """
 
+import asyncio
 import os
 import logging
+import random
+import sys
+import time
 from datetime import datetime
+from typing import Optional
+
+import orjson
+
+from . import oauth_cache, token_store
+from .config import get_settings
+from .utils.embedding_cache import embedding_cache
 
 logger = logging.getLogger(__name__)
 
+# Refresh the Google access token this long before it expires
+TOKEN_REFRESH_LEAD_SECONDS = 300
 
-def get_health_status() -> dict:
-    """Get basic health status."""
-    
-    required_vars = [
-        'OPENAI_API_KEY', 'OPENROUTER_API_KEY', 'PERPLEXITY_API_KEY',
-        'PINECONE_API_KEY', 'GOOGLE_CLIENT_ID', 'GOOGLE_REFRESH_TOKEN'
-    ]
-    
-    configured_apis = sum(1 for var in required_vars if os.getenv(var))
+# Reuse a computed health status for this long so probe bursts stay cheap
+HEALTH_CACHE_TTL_SECONDS = 5.0
+
+_REQUIRED_VARS = frozenset({
+    'OPENAI_API_KEY', 'OPENROUTER_API_KEY', 'PERPLEXITY_API_KEY',
+    'PINECONE_API_KEY', 'GOOGLE_CLIENT_ID', 'GOOGLE_REFRESH_TOKEN'
+})
+_GOOGLE_OAUTH_VARS = ('GOOGLE_CLIENT_ID', 'GOOGLE_CLIENT_SECRET', 'GOOGLE_REFRESH_TOKEN')
+_REQUIRED_COUNT = len(_REQUIRED_VARS)
+_PY_VERSION = sys.version.partition(' ')[0]
+
+
+def _config_status() -> dict:
+    """Health fields derived from the environment, which is fixed once the server runs."""
+    # A service account replaces the Google OAuth client + refresh token
+    service_account = bool(os.environ.get('GOOGLE_SERVICE_ACCOUNT_JSON'))
+    configured_apis = sum(
+        1 for var in _REQUIRED_VARS
+        if os.environ.get(var) or (service_account and var in _GOOGLE_OAUTH_VARS)
+    )
     
     return {
         "status": "healthy" if configured_apis >= 5 else "degraded",
-        "apis_configured": f"{configured_apis}/{len(required_vars)}",
-        "environment": "Railway" if os.getenv('RAILWAY_PROJECT_ID') else "Local",
-        "timestamp": datetime.now().isoformat()
+        "apis_configured": f"{configured_apis}/{_REQUIRED_COUNT}",
+        "environment": "Railway" if os.environ.get('RAILWAY_PROJECT_ID') else "Local",
+        "python_version": _PY_VERSION
+    }
+
+
+def get_health_status(now: Optional[datetime] = None, config_status: Optional[dict] = None) -> dict:
+    """Get basic health status, reusing precomputed config fields when given."""
+    now = now or datetime.now()
+    
+    return {
+        **(config_status or _config_status()),
+        "token_cached": token_store.warmup() is not None,
+        "timestamp": now.isoformat()
     }
 
 
 def log_startup_info():
     """Log startup information."""
-    health = get_health_status()
+    health = health_checker.get_health_status(force=True)
     
     logger.info("🚀 Chloros Blog MCP Server")
-    logger.info(f"Status: {health['status'].upper()}")
-    logger.info(f"Environment: {health['environment']}")
-    logger.info(f"APIs configured: {health['apis_configured']}")
+    logger.info("Status: %s", health['status'].upper())
+    logger.info("Environment: %s", health['environment'])
+    logger.info("APIs configured: %s", health['apis_configured'])
+    logger.info("Google token cache: %s", 'warm' if health['token_cached'] else 'cold')
     
     if health['environment'] == 'Railway':
-        project_id = os.getenv('RAILWAY_PROJECT_ID', 'Unknown')
-        logger.info(f"Railway Project: {project_id}")
+        project_id = os.environ.get('RAILWAY_PROJECT_ID', 'Unknown')
+        logger.info("Railway Project: %s", project_id)
 
 
 # Create global instance for backward compatibility
 class HealthChecker:
-    def get_health_status(self):
-        return get_health_status()
+    def __init__(self):
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._next_refresh_at: Optional[float] = None
+        self._cache: Optional[dict] = None
+        self._cache_ts = 0.0
+        self._cached_bytes = b""
+        self._config_status: Optional[dict] = None
+        self.start_time = datetime.now()
+        self.start_time_iso = self.start_time.isoformat()
+    
+    def get_health_status(self, force: bool = False):
+        now = time.monotonic()
+        if not force and self._cache and now - self._cache_ts < HEALTH_CACHE_TTL_SECONDS:
+            return self._cache
+        
+        # Built on first use, after main has loaded .env into the environment
+        if self._config_status is None:
+            self._config_status = _config_status()
+        
+        # One wall-clock read serves both the timestamp and the uptime
+        wall_now = datetime.now()
+        status = get_health_status(wall_now, self._config_status)
+        status["started_at"] = self.start_time_iso
+        status["uptime_seconds"] = int((wall_now - self.start_time).total_seconds())
+        if self._next_refresh_at is not None:
+            status["next_refresh_in"] = max(0, int(self._next_refresh_at - now))
+        status["embedding_cache"] = embedding_cache.stats()
+        
+        self._cache = status
+        self._cache_ts = now
+        self._cached_bytes = orjson.dumps(status)
+        return status
+    
+    def get_health_bytes(self) -> bytes:
+        """Get the health status as JSON bytes, serialized once per cache period."""
+        self.get_health_status()
+        return self._cached_bytes
     
     def log_startup_info(self):
         return log_startup_info()
+    
+    async def start(self):
+        """Start refreshing the Google access token in the background."""
+        if self._refresh_task and not self._refresh_task.done():
+            return
+        
+        settings = get_settings()
+        
+        # Service accounts and unconfigured deployments have no refresh token to keep warm
+        if settings.google_service_account_json or not settings.google_refresh_token:
+            return
+        
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+    
+    async def stop(self):
+        """Cancel the background token refresh."""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+            self._next_refresh_at = None
+    
+    async def _refresh_loop(self):
+        """Refresh the token shortly before expiry so requests never wait on it."""
+        settings = get_settings()
+        
+        # Load the token first (from memory, the token file, or Google) so the first
+        # delay reflects its real lifetime rather than an empty cache
+        try:
+            await asyncio.to_thread(
+                oauth_cache.get_access_token,
+                settings.google_client_id,
+                settings.google_client_secret,
+                settings.google_refresh_token
+            )
+        except Exception as e:
+            logger.warning("Could not load Google token for background refresh: %s", e)
+        
+        while True:
+            expires_in = oauth_cache.seconds_until_expiry(settings.google_client_id)
+            delay = max(30, expires_in - TOKEN_REFRESH_LEAD_SECONDS)
+            self._next_refresh_at = time.monotonic() + delay
+            await asyncio.sleep(delay)
+            
+            try:
+                await asyncio.to_thread(
+                    oauth_cache.force_refresh,
+                    settings.google_client_id,
+                    settings.google_client_secret,
+                    settings.google_refresh_token
+                )
+            except Exception as e:
+                logger.warning("Background Google token refresh failed: %s", e)
+                # Spread retries from several replicas so they don't hit Google in lockstep
+                await asyncio.sleep(random.uniform(0, 0.25) * TOKEN_REFRESH_LEAD_SECONDS)
 
-health_checker = HealthChecker()
\ No newline at end of file
+health_checker = HealthChecker()
@@ -0,0 +1,53 @@
+"""
+Shared HTTP clients for outbound API calls.
+Keeps HTTP/2 connections alive between requests instead of reconnecting per call.
+"""
+
+from functools import lru_cache
+
+import httpx
+
+from .config import get_settings
+
+# Connection failures are retried by the transport; HTTP status handling is left to callers
+SESSION = httpx.Client(
+    timeout=httpx.Timeout(10.0, connect=3.05),
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=3,
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+    ),
+)
+
+
+@lru_cache(maxsize=1)
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the HTTP/2 client shared by the OpenAI, OpenRouter and Perplexity services.
+    
+    One pool means one place to bound open sockets; the per-provider semaphores
+    still decide how many of them each provider may use at once. Callers pass
+    their provider's timeout per request.
+    
+    Returns:
+        Client meant to live as long as the process; closed by close_async_client()
+    """
+    settings = get_settings()
+    max_connections = (
+        settings.openai_max_concurrency
+        + settings.openrouter_max_concurrency
+        + settings.perplexity_max_concurrency
+    )
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(60.0, connect=3.05),
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+    )
+
+
+async def close_async_client() -> None:
+    """Close the shared async client if it was ever created; the next call builds a new one."""
+    if get_async_client.cache_info().currsize:
+        client = get_async_client()
+        get_async_client.cache_clear()
+        await client.aclose()
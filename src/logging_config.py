@@ -0,0 +1,41 @@
+"""
+Logging setup for the MCP server.
+Keeps log formatting and stream writes off the event loop.
+"""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+# Client libraries that log every request (and, for HTTP/2, every frame) at INFO/DEBUG
+NOISY_LOGGERS = ("httpx", "httpcore", "hpack", "h2", "openai", "urllib3")
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueue records as-is so message and timestamp formatting run on the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue never leaves this process, so the record needs no pickling-safe copy
+        return record
+
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """
+    Route all records through a queue to a background thread that writes to stderr.
+
+    Args:
+        level: Root logger level
+    """
+    log_queue = queue.SimpleQueue()
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+
+    logging.basicConfig(level=level, handlers=[_DeferredQueueHandler(log_queue)])
+    # Their records are dropped at the logger instead of being built, queued and discarded
+    for name in NOISY_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+    listener = QueueListener(log_queue, stream)
+    listener.start()
+    # Flush whatever is still queued when the process exits
+    atexit.register(listener.stop)
@@ -5,72 +5,245 @@ Chloros Blog MCP Server - Railway Compatible
 import asyncio
 import logging
 import os
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from fastmcp import FastMCP
 from dotenv import load_dotenv
+import orjson
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .config import get_settings
+from .health import health_checker
+from .logging_config import setup_logging
+from .models.content import Article, ContentStrategy, Section, SEOStrategy, ContentRestrictions
+from .models.evaluation import Evaluation
+from .services import (
+    close_services,
+    get_google_service,
+    get_openai_service,
+    get_openrouter_service,
+    get_perplexity_service,
+    get_pinecone_service
+)
+from .utils.embedding_cache import embedding_cache
+from .utils.research_cache import CACHE_DIR, ResearchCache
+from .utils.scoring_engine import ScoringEngine
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (formatting and writes happen on a background thread)
+setup_logging(logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def process_lifespan():
+    """
+    Start background refreshers and warm caches for the lifetime of the process.
+    
+    Not passed to FastMCP as its lifespan: over HTTP that lifespan is entered once per
+    MCP session, and closing the shared HTTP client when one session ends would break
+    every later one. main() enters this once around whichever transport it serves.
+    """
+    await health_checker.start()
+    await asyncio.gather(
+        asyncio.to_thread(research_cache.load, RESEARCH_CACHE_PATH),
+        asyncio.to_thread(embedding_cache.load, EMBEDDING_CACHE_PATH)
+    )
+    patterns_task = asyncio.create_task(_refresh_patterns_periodically())
+    # Local stdio sessions are short-lived; only long-running deployments pay for a warm-up
+    warmup_task = asyncio.create_task(_warm_up_services()) if os.environ.get('RAILWAY_PROJECT_ID') else None
+    try:
+        yield {}
+    finally:
+        patterns_task.cancel()
+        if warmup_task is not None:
+            warmup_task.cancel()
+        await health_checker.stop()
+        await close_services()
+        await asyncio.gather(
+            asyncio.to_thread(research_cache.dump, RESEARCH_CACHE_PATH),
+            asyncio.to_thread(embedding_cache.dump, EMBEDDING_CACHE_PATH)
+        )
+
+
+async def _warm_up_services():
+    """Build every service singleton in the background so the first tool calls find them ready."""
+    # The HTTP-based services only build clients; constructing them on the loop means a
+    # tool call can never race a worker thread into creating a second connection pool
+    get_openai_service()
+    get_openrouter_service()
+    get_perplexity_service()
+    
+    # Pinecone resolves its index and Google fetches credentials, both blocking
+    getters = (get_pinecone_service, get_google_service)
+    results = await asyncio.gather(
+        *(asyncio.to_thread(getter) for getter in getters),
+        return_exceptions=True
+    )
+    for getter, result in zip(getters, results):
+        if isinstance(result, Exception):
+            logger.warning("Warm-up of %s failed: %s", getter.__name__, result)
+
+
+# Repeated and near-identical medical searches reuse earlier Pinecone results,
+# including across restarts
+research_cache = ResearchCache()
+RESEARCH_CACHE_PATH = CACHE_DIR / "research_cache.json"
+# Query embeddings outlive research results (24h vs 1h), so they are persisted too
+EMBEDDING_CACHE_PATH = CACHE_DIR / "embedding_cache.json"
+
+# Whole research_topic results, keyed by topic and keywords; bump the version when
+# the research prompts or result shape change so stale entries are not served
+RESEARCH_TOPIC_CACHE_VERSION = 1
+topic_cache = ResearchCache(max_entries=128)
+
+# The scoring engine keeps no per-article state, so one instance serves every call
+scoring_engine = ScoringEngine({})
+
+# Sheet patterns change rarely: keep the last good copy in memory and reload it in the background
+_patterns: dict | None = None
+_patterns_lock = asyncio.Lock()
+
+def _serialize_tool_result(data: object) -> str:
+    """Serialize tool results with orjson instead of pydantic's indented JSON."""
+    return orjson.dumps(data, default=str).decode()
+
+
 # Create FastMCP server
-mcp = FastMCP("Chloros Blog MCP Server")
+# Every tool is registered here exactly once; tools that share work (single and
+# batch variants, research_topic) call the same private helper instead of each other
+mcp = FastMCP("Chloros Blog MCP Server", tool_serializer=_serialize_tool_result)
+
+
+@mcp.custom_route("/health", methods=["GET"])
+async def health(request: Request) -> Response:
+    """Health probe for Railway, served from pre-serialized bytes."""
+    # A refresh reads the token cache under a file lock, which must not stall the loop
+    content = await asyncio.to_thread(health_checker.get_health_bytes)
+    return Response(content=content, media_type="application/json")
 
 
 @mcp.tool()
 async def search_pinecone_medical(topic: str, keywords: str) -> dict:
     """Step 3: Search Pinecone medical database for clinical information about treatment procedures, success rates, patient safety, recovery timelines, and contraindications."""
+    return await _search_pinecone_medical(topic, keywords)
+
+
+@mcp.tool()
+async def search_pinecone_medical_batch(queries: list[dict]) -> list[dict]:
+    """Step 3 for several topics: search the medical database with one embedding request. Each query is {"topic": ..., "keywords": ...}."""
+    return await _search_pinecone_medical_batch(
+        [(q.get("topic", ""), q.get("keywords", "")) for q in queries]
+    )
+
+
+async def _search_pinecone_medical(topic: str, keywords: str) -> dict:
+    """Medical database search shared by step 3 and research_topic."""
+    return (await _search_pinecone_medical_batch([(topic, keywords)]))[0]
+
+
+def _medical_query(topic: str, keywords: str) -> str:
+    """Build the medical search query (matching N8n approach)."""
+    return f"Find clinical information about {topic}: treatment procedures, success rates and outcomes, patient safety, recovery timelines, medical contraindications {keywords}"
+
+
+async def _search_pinecone_medical_batch(queries: list[tuple[str, str]]) -> list[dict]:
+    """Search the medical database for several (topic, keywords) pairs, embedding all misses at once."""
+    results: list[dict] = [{} for _ in queries]
+    texts = [_medical_query(topic, keywords) for topic, keywords in queries]
+    
     try:
-        from .services.openai_service import OpenAIService
-        from .services.pinecone_service import PineconeService
+        logger.info("Searching medical database for: %s", ', '.join(topic for topic, _ in queries))
         
-        logger.info(f"Searching medical database for: {topic}")
+        # Exact repeats need neither an embedding nor a Pinecone query; a query repeated
+        # within the batch is embedded and searched once for all of its positions
+        pending: dict[str, list[int]] = {}
+        for i, query in enumerate(texts):
+            cached = research_cache.get_exact(query)
+            if cached:
+                results[i] = {**cached, "cache_hit": "exact"}
+            else:
+                pending.setdefault(query, []).append(i)
         
-        openai_service = OpenAIService()
-        pinecone_service = PineconeService()
+        if not pending:
+            return results
         
-        # Create embedding for medical query (matching N8n approach)
-        query = f"Find clinical information about {topic}: treatment procedures, success rates and outcomes, patient safety, recovery timelines, medical contraindications {keywords}"
-        embedding = await openai_service.create_embeddings(query)
+        unique_texts = list(pending)
+        embeddings = await get_openai_service().create_embeddings_batch(unique_texts)
         
-        # Search with topK=25 as in your N8n setup
-        results = await pinecone_service.search_medical_knowledge(embedding, top_k=25)
+        to_search = []
+        for query, embedding in zip(unique_texts, embeddings):
+            cached = research_cache.get_similar(embedding)
+            if cached:
+                for i in pending[query]:
+                    results[i] = {**cached, "topic": queries[i][0], "query_used": query, "cache_hit": "semantic"}
+            else:
+                to_search.append((query, embedding))
         
-        # Extract medical facts for patient education
-        medical_facts = []
-        for result in results[:10]:  # Top 10 most relevant
-            content = result.get('content', '')
-            if content:
-                medical_facts.append(content)
+        # Search with topK=25 (PINECONE_TOP_K) as in your N8n setup, all topics concurrently
+        # A cold start resolves the index over the network, so keep it off the event loop
+        pinecone_service = await asyncio.to_thread(get_pinecone_service)
+        top_k = get_settings().pinecone_top_k
+        # A failed search cancels the rest instead of leaving them running unobserved
+        async with asyncio.TaskGroup() as tg:
+            searches = [
+                tg.create_task(pinecone_service.search_medical_knowledge(embedding, top_k=top_k))
+                for _, embedding in to_search
+            ]
         
-        return {
-            "topic": topic,
-            "query_used": query,
-            "results_count": len(results),
-            "medical_facts": medical_facts,
-            "status": "success"
-        }
+        for (query, embedding), search in zip(to_search, searches):
+            matches = search.result()
+            # Extract medical facts for patient education
+            medical_facts = []
+            for match in matches[:10]:  # Top 10 most relevant
+                content = match.get('content', '')
+                if content:
+                    medical_facts.append(content)
+            
+            indices = pending[query]
+            result = {
+                "topic": queries[indices[0]][0],
+                "query_used": query,
+                "results_count": len(matches),
+                "medical_facts": medical_facts,
+                "status": "success"
+            }
+            research_cache.put(query, embedding, result)
+            for i in indices:
+                results[i] = result
+        
+        return results
     except Exception as e:
-        logger.error(f"Medical research error: {e}")
-        return {
-            "topic": topic,
-            "error": str(e),
-            "medical_facts": [f"Error accessing medical database for {topic}: {str(e)}"],
-            "status": "error"
-        }
+        # Report the failing search itself rather than the TaskGroup wrapper
+        if isinstance(e, ExceptionGroup):
+            e = e.exceptions[0]
+        logger.error("Medical research error: %s", e)
+        return [
+            result or {
+                "topic": topic,
+                "error": str(e),
+                "medical_facts": [f"Error accessing medical database for {topic}: {str(e)}"],
+                "status": "error"
+            }
+            for result, (topic, _) in zip(results, queries)
+        ]
 
 
 @mcp.tool()
 async def cultural_context_research(topic: str) -> dict:
     """Step 1: Research Greek cultural context for medical topic."""
+    return await _cultural_context_research(topic)
+
+
+async def _cultural_context_research(topic: str) -> dict:
+    """Cultural context research shared by step 1 and research_topic."""
     try:
-        from .services.perplexity_service import PerplexityService
-        
-        logger.info(f"Researching Greek cultural context for: {topic}")
+        logger.info("Researching Greek cultural context for: %s", topic)
         
-        service = PerplexityService()
+        service = get_perplexity_service()
         result = await service.research_cultural_context(topic)
         
         return {
@@ -80,7 +253,7 @@ async def cultural_context_research(topic: str) -> dict:
             "status": "success"
         }
     except Exception as e:
-        logger.error(f"Cultural research error: {e}")
+        logger.error("Cultural research error: %s", e)
         return {
             "topic": topic,
             "error": str(e),
@@ -93,10 +266,56 @@ async def cultural_context_research(topic: str) -> dict:
 @mcp.tool()
 async def read_blog_patterns() -> dict:
     """Step 2: Read all patterns, structure, scoring matrix, and fixes from Google Sheets."""
+    return await _read_blog_patterns()
+
+
+@mcp.tool()
+async def invalidate_patterns_cache() -> dict:
+    """Reload patterns from Google Sheets now, e.g. right after editing the sheet."""
+    global _patterns
+    async with _patterns_lock:
+        _patterns = None
+    # Cached research_topic results embed the old patterns
+    topic_cache.clear()
+    return await _read_blog_patterns()
+
+
+async def _read_blog_patterns() -> dict:
+    """Pattern loading shared by step 2 and research_topic, served from memory once loaded."""
+    global _patterns
+    if _patterns is not None:
+        return _patterns
+    
+    # Concurrent cold-start callers share a single Sheets read
+    async with _patterns_lock:
+        if _patterns is not None:
+            return _patterns
+        result = await _fetch_blog_patterns()
+        if result["status"] == "success":
+            _patterns = result
+        return result
+
+
+async def _refresh_patterns_periodically():
+    """Load patterns at startup, then keep them fresh so tool calls never wait on Sheets."""
+    global _patterns
+    while True:
+        result = await _fetch_blog_patterns()
+        # A failed reload keeps serving the previous copy
+        if result["status"] == "success":
+            # Cached research_topic results embed the patterns; drop them once the sheet changes
+            if _patterns is not None and result != _patterns:
+                logger.info("Blog patterns changed in Google Sheets; clearing cached research")
+                topic_cache.clear()
+            _patterns = result
+        await asyncio.sleep(get_settings().patterns_refresh_seconds)
+
+
+async def _fetch_blog_patterns() -> dict:
+    """Read the patterns from Google Sheets."""
     try:
-        from .services.google_service import GoogleService
-        
-        service = GoogleService()
+        # First construction may refresh credentials, which blocks
+        service = await asyncio.to_thread(get_google_service)
         patterns = await service.read_blog_patterns()
         
         return {
@@ -115,7 +334,7 @@ async def read_blog_patterns() -> dict:
             "status": "success"
         }
     except Exception as e:
-        logger.error(f"Pattern reading error: {e}")
+        logger.error("Pattern reading error: %s", e)
         return {
             "error": str(e), 
             "approved_patterns": [], 
@@ -127,6 +346,42 @@ async def read_blog_patterns() -> dict:
         }
 
 
+@mcp.tool()
+async def research_topic(topic: str, keywords: str) -> dict:
+    """Steps 1-3 at once: run cultural research, pattern loading and medical search concurrently."""
+    cache_key = f"v{RESEARCH_TOPIC_CACHE_VERSION}\n{topic}\n{keywords}"
+    cached = topic_cache.get_exact(cache_key)
+    if cached:
+        logger.info("Serving research for %s from cache", topic)
+        return {**cached, "cache_hit": "exact"}
+    
+    # The three steps hit independent backends, so the phase takes as long as the
+    # slowest one; each turns its failures into an error dict, so one failing
+    # backend never cancels the others (the status below becomes "partial").
+    # There is no step to start early on the first result: the client calls
+    # create_content_strategy itself and needs the cultural context for it.
+    cultural, patterns, medical = await asyncio.gather(
+        _cultural_context_research(topic),
+        _read_blog_patterns(),
+        _search_pinecone_medical(topic, keywords)
+    )
+    
+    result = {
+        "topic": topic,
+        "cultural_context": cultural,
+        "blog_patterns": patterns,
+        "medical_research": medical,
+        "status": "success" if all(
+            r["status"] == "success" for r in (cultural, patterns, medical)
+        ) else "partial"
+    }
+    
+    # Partial results are retried on the next call rather than pinned for the TTL
+    if result["status"] == "success":
+        topic_cache.put(cache_key, None, result)
+    return result
+
+
 @mcp.tool()
 async def create_content_strategy(
     topic: str,
@@ -138,9 +393,7 @@ async def create_content_strategy(
 ) -> dict:
     """Step 4: Create content strategy based on research."""
     try:
-        from .services.openai_service import OpenAIService
-        
-        service = OpenAIService()
+        service = get_openai_service()
         strategy = await service.create_content_strategy(
             topic=topic,
             main_keywords=keywords,
@@ -167,7 +420,7 @@ async def create_content_strategy(
             "status": "success"
         }
     except Exception as e:
-        logger.error(f"Strategy creation error: {e}")
+        logger.error("Strategy creation error: %s", e)
         return {
             "error": str(e), 
             "h1_title": f"Άρθρο για {topic}",
@@ -184,37 +437,56 @@ async def generate_blog_post(
     target_words: int,
     medical_facts: str,
     cultural_context: str,
-    strategy: str
+    strategy: str,
+    attempts: int = 1
 ) -> dict:
-    """Step 5: Generate complete Greek medical blog post."""
-    try:
-        from .services.openrouter_service import OpenRouterService
-        from .models.content import ContentStrategy, Section, SEOStrategy, ContentRestrictions
-        
-        # Create simple strategy
-        section = Section(
-            title="Κύριο Περιεχόμενο",
-            content_points=[f"Πληροφορίες για {topic}", "Ιατρικές λεπτομέρειες"],
-            target_words=target_words
+    """Step 5: Generate complete Greek medical blog post. With attempts > 1, drafts are written concurrently and the first to pass the quality gate is returned."""
+    return await _generate_blog_post(topic, target_words, medical_facts, cultural_context, attempts)
+
+
+@mcp.tool()
+async def generate_blog_posts_batch(posts: list[dict]) -> list[dict]:
+    """Step 5 for several topics: generate the articles concurrently in one call. Each post is {"topic": ..., "target_words": ..., "medical_facts": ..., "cultural_context": ...}."""
+    # Each article is its own completion (one response could not hold several long
+    # articles); the OpenRouter semaphore bounds how many are generated at once
+    return list(await asyncio.gather(*(
+        _generate_blog_post(
+            post.get("topic", ""),
+            int(post.get("target_words", 2000)),
+            post.get("medical_facts", ""),
+            post.get("cultural_context", "")
         )
+        for post in posts
+    )))
+
+
+async def _generate_blog_post(
+    topic: str,
+    target_words: int,
+    medical_facts: str,
+    cultural_context: str,
+    attempts: int = 1
+) -> dict:
+    """Article generation shared by step 5 and its batch variant; errors are returned, never raised."""
+    try:
+        strategy = _default_strategy(topic, target_words)
         
-        strategy = ContentStrategy(
-            h1_title=f"Οδηγός για {topic}",
-            content_sections=[section],
-            seo_strategy=SEOStrategy(
-                main_keyword_placement=["H1", "first paragraph"],
-                secondary_distribution=["section 2"]
-            ),
-            content_restrictions=ContentRestrictions(
-                avoid=["emotional stories"],
-                alternatives=["evidence-based content"],
-                voice_requirements=["third person"]
-            ),
-            medical_focus=[topic],
-            target_word_count=target_words
-        )
+        if attempts > 1:
+            article, evaluation = await _first_passing_article(
+                strategy, medical_facts, cultural_context, topic,
+                min(attempts, get_settings().max_retries)
+            )
+            return {
+                "topic": topic,
+                "article_markdown": article.article_markdown,
+                "word_count": article.word_count,
+                "h1_title": article.h1_title,
+                "total_score": evaluation.total_score,
+                "passes_quality": evaluation.passes_quality_gate,
+                "status": "success"
+            }
         
-        service = OpenRouterService()
+        service = get_openrouter_service()
         article = await service.generate_complete_article(
             strategy=strategy,
             medical_facts=medical_facts,
@@ -231,7 +503,7 @@ async def generate_blog_post(
         }
         
     except Exception as e:
-        logger.error(f"Article generation error: {e}")
+        logger.error("Article generation error: %s", e)
         return {
             "error": str(e), 
             "article_markdown": f"# {topic}\n\nΣφάλμα στη δημιουργία άρθρου.",
@@ -241,14 +513,98 @@ async def generate_blog_post(
         }
 
 
+# Topic-independent parts of the default strategy, validated once at import and shared
+_DEFAULT_SEO_STRATEGY = SEOStrategy(
+    main_keyword_placement=["H1", "first paragraph"],
+    secondary_distribution=["section 2"]
+)
+_DEFAULT_RESTRICTIONS = ContentRestrictions(
+    avoid=["emotional stories"],
+    alternatives=["evidence-based content"],
+    voice_requirements=["third person"]
+)
+
+
+@lru_cache(maxsize=64)
+def _default_strategy(topic: str, target_words: int) -> ContentStrategy:
+    """Build the simple single-section strategy once per topic and length; callers must not mutate it."""
+    # Every field is a known-good literal or an already validated tool argument,
+    # so the models are constructed without running validation
+    section = Section.model_construct(
+        title="Κύριο Περιεχόμενο",
+        content_points=[f"Πληροφορίες για {topic}", "Ιατρικές λεπτομέρειες"],
+        target_words=target_words
+    )
+    
+    return ContentStrategy.model_construct(
+        h1_title=f"Οδηγός για {topic}",
+        content_sections=[section],
+        seo_strategy=_DEFAULT_SEO_STRATEGY,
+        content_restrictions=_DEFAULT_RESTRICTIONS,
+        medical_focus=[topic],
+        target_word_count=target_words
+    )
+
+
+async def _first_passing_article(
+    strategy: ContentStrategy,
+    medical_facts: str,
+    cultural_context: str,
+    topic: str,
+    attempts: int
+) -> tuple[Article, Evaluation]:
+    """Write drafts concurrently; return the first that passes the quality gate, else the best scored."""
+    # The research arrives as ready-made strings, so every draft shares them without re-joining
+    service = get_openrouter_service()
+    
+    async def draft() -> tuple[Article, Evaluation]:
+        article = await service.generate_complete_article(
+            strategy=strategy,
+            medical_facts=medical_facts,
+            cultural_context=cultural_context,
+            patterns={}
+        )
+        evaluation = await asyncio.to_thread(
+            scoring_engine.evaluate_article, article.article_markdown, strategy.target_word_count, topic
+        )
+        return article, evaluation
+    
+    # The OpenRouter semaphore still caps how many drafts are generated at once
+    pending = {asyncio.create_task(draft()) for _ in range(attempts)}
+    best = None
+    try:
+        while pending:
+            # Finished tasks leave the set, so an outscored draft's markdown is released
+            # right away instead of living until the last attempt completes
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                try:
+                    article, evaluation = task.result()
+                except Exception as e:
+                    logger.warning("Draft attempt failed: %s", e)
+                    continue
+                if evaluation.passes_quality_gate:
+                    return article, evaluation
+                if best is None or evaluation.total_score > best[1].total_score:
+                    best = (article, evaluation)
+    finally:
+        # Stop paying for drafts that are no longer needed
+        for task in pending:
+            task.cancel()
+    
+    if best is None:
+        raise RuntimeError(f"All {attempts} draft attempts failed")
+    return best
+
+
 @mcp.tool()
 async def evaluate_article(article_content: str, target_words: int) -> dict:
     """Step 6: Evaluate article quality with 4-category scoring system."""
     try:
-        from .utils.scoring_engine import ScoringEngine
-        
-        engine = ScoringEngine({})
-        evaluation = engine.evaluate_article(article_content, target_words, "Medical Topic")
+        # Scoring is pure CPU work over the whole article; keep the event loop free meanwhile
+        evaluation = await asyncio.to_thread(
+            scoring_engine.evaluate_article, article_content, target_words, "Medical Topic"
+        )
         
         return {
             "total_score": evaluation.total_score,
@@ -260,7 +616,7 @@ async def evaluate_article(article_content: str, target_words: int) -> dict:
         }
         
     except Exception as e:
-        logger.error(f"Evaluation error: {e}")
+        logger.error("Evaluation error: %s", e)
         return {
             "error": str(e), 
             "total_score": 0,
@@ -280,9 +636,7 @@ async def export_to_google_doc(
 ) -> dict:
     """Step 7: Export article to Google Doc in Drive folder."""
     try:
-        from .services.google_service import GoogleService
-        
-        service = GoogleService()
+        service = await asyncio.to_thread(get_google_service)
         status = "PASS" if quality_score >= 80 else "FAIL"
         
         result = await service.create_google_doc(
@@ -299,7 +653,7 @@ async def export_to_google_doc(
             "status": "success"
         }
     except Exception as e:
-        logger.error(f"Google Doc export error: {e}")
+        logger.error("Google Doc export error: %s", e)
         return {
             "error": str(e), 
             "doc_url": "",
@@ -310,7 +664,41 @@ async def export_to_google_doc(
         }
 
 
-# Complete workflow tool removed - use individual steps instead
+# Complete workflow tool removed - use individual steps instead.
+# research_topic already overlaps the independent steps 1-3; steps 4-7 each need
+# the previous step's complete output, so there is nothing further to pipeline
+# server-side. Starting the Google Doc before scoring
+# finishes would also cost an extra rename call, since the PASS/REVIEW title
+# suffix comes from the score the client passes to export_to_google_doc.
+# Checkpointing belongs with the same caller: every step returns its full output,
+# so a failed export (or a failed draft) is retried with what the client already
+# holds, without re-running research or generation.
+
+
+async def _run_stdio():
+    """Serve MCP over stdio with the process-wide resources around it."""
+    async with process_lifespan():
+        await mcp.run_stdio_async()
+
+
+def _http_app():
+    """
+    Build the Streamable HTTP app with the process-wide resources in its Starlette lifespan.
+    
+    Returns:
+        ASGI app whose lifespan runs process_lifespan() around FastMCP's session manager
+    """
+    app = mcp.http_app()
+    session_lifespan = app.router.lifespan_context
+    
+    @asynccontextmanager
+    async def app_lifespan(app):
+        # Entered once by uvicorn; sessions are torn down before the shared resources
+        async with process_lifespan(), session_lifespan(app):
+            yield
+    
+    app.router.lifespan_context = app_lifespan
+    return app
 
 
 def main():
@@ -318,23 +706,35 @@ def main():
     try:
         logger.info("🚀 Starting Chloros Blog MCP Server")
         
+        # libuv-based event loop for both transports; must be set before any loop starts
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            logger.info("uvloop not available - using the default asyncio event loop")
+        
+        # Startup work (cache loading, token refresh, warm-up) lives in process_lifespan(),
+        # entered on the loop that serves requests so its clients stay usable; keep it there
+        # rather than preparing anything with a separate asyncio.run() before serving
+        
         # Check environment
         is_railway = bool(os.getenv('RAILWAY_PROJECT_ID'))
         port = int(os.getenv('PORT', 3000))
         
         if is_railway:
-            logger.info(f"Railway deployment detected - starting HTTP server on port {port}")
+            logger.info("Railway deployment detected - starting HTTP server on port %s", port)
             # For Railway, run HTTP server
             import uvicorn
-            app = mcp.http_app()
-            uvicorn.run(app, host="0.0.0.0", port=port)
+            app = _http_app()
+            # uvicorn[standard] provides uvloop and httptools; "auto" falls back to asyncio/h11 without them
+            uvicorn.run(app, host="0.0.0.0", port=port, loop="auto", http="auto")
         else:
             logger.info("Local development - starting MCP stdio server")
             # For local, run stdio
-            mcp.run()
+            asyncio.run(_run_stdio())
             
     except Exception as e:
-        logger.error(f"Server startup error: {e}")
+        logger.error("Server startup error: %s", e)
         raise
 
 
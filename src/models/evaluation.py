@@ -4,7 +4,7 @@ Evaluation and scoring models for quality assessment.
 
 from typing import Optional, Dict, Any
 from typing import List  # Separate import for Railway compatibility
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 
 
 class ScoreBreakdown(BaseModel):
@@ -27,7 +27,6 @@ class Evaluation(BaseModel):
     # Word count analysis
     word_count_actual: int = Field(..., description="Actual word count of the article")
     word_count_target: int = Field(..., description="Target word count")
-    word_count_deviation_percent: float = Field(..., description="Percentage deviation from target")
     
     # Quality assessment
     critical_issues: List[str] = Field(..., description="Critical issues found in the article")
@@ -44,13 +43,13 @@ class Evaluation(BaseModel):
     retry_count: int = Field(default=0, description="Number of retry attempts")
     previous_scores: Optional[List[int]] = Field(None, description="Previous attempt scores")
     
-    def calculate_word_count_deviation(self) -> float:
-        """Calculate word count deviation percentage."""
+    @computed_field(description="Percentage deviation from target")
+    @property
+    def word_count_deviation_percent(self) -> float:
+        """Word count deviation percentage, derived from the actual and target counts."""
         if self.word_count_target == 0:
             return 0.0
-        deviation = ((self.word_count_actual - self.word_count_target) / self.word_count_target) * 100
-        self.word_count_deviation_percent = deviation
-        return deviation
+        return ((self.word_count_actual - self.word_count_target) / self.word_count_target) * 100
     
     def determine_pass_status(self, pass_threshold: int = 80, word_count_fail_threshold: float = -15.0) -> bool:
         """Determine if article passes quality gate."""
@@ -66,7 +65,7 @@ class Evaluation(BaseModel):
             "previous_score": self.total_score,
             "critical_issues": self.critical_issues,
             "improvements_needed": self.improvements_needed,
-            "score_breakdown": self.score_breakdown.dict(),
+            "score_breakdown": self.score_breakdown.model_dump(),
             "word_count_issue": self.word_count_deviation_percent < -15.0,
             "retry_count": self.retry_count
         }
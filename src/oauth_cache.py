@@ -0,0 +1,164 @@
+"""
+In-process cache for Google OAuth access tokens.
+Avoids a round-trip to the token endpoint every time a Google client is built.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Tuple
+
+import httpx
+from tenacity import (
+    before_sleep_log,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+from . import token_store
+from .http_client import SESSION
+
+logger = logging.getLogger(__name__)
+
+TOKEN_URL = "https://oauth2.googleapis.com/token"
+
+GOOGLE_SCOPES = (
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/documents",
+    "https://www.googleapis.com/auth/drive",
+)
+
+# Refresh this many seconds before Google reports the token as expired
+REFRESH_MARGIN_SECONDS = 60
+
+# Fixed part of every refresh request; per-call credentials are merged in
+_REFRESH_BASE = {"grant_type": "refresh_token"}
+
+# Token endpoint responses worth retrying rather than failing the caller
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# (access_token, expires_at) keyed by client_id + scopes; expires_at is time.monotonic()
+_TOKENS: Dict[str, Tuple[str, float]] = {}
+_lock = threading.Lock()
+
+
+def _cache_key(client_id: str, scopes: Tuple[str, ...]) -> str:
+    """Build the cache key for a client and scope set."""
+    return f"{client_id}:{' '.join(scopes)}"
+
+
+def to_wall_clock(expires_at: float) -> float:
+    """Convert a time.monotonic() expiry into a time.time() one, e.g. for the token file."""
+    return time.time() + (expires_at - time.monotonic())
+
+
+def from_wall_clock(wall_expires_at: float) -> float:
+    """Convert a time.time() expiry into a time.monotonic() one."""
+    return time.monotonic() + (wall_expires_at - time.time())
+
+
+def to_utc_datetime(expires_at: float) -> datetime:
+    """Convert a time.monotonic() expiry into the naive UTC datetime google-auth expects."""
+    return datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=expires_at - time.monotonic())
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Whether a token request failure is likely to succeed on retry."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRY_STATUS_CODES
+    return isinstance(exc, httpx.TransportError)
+
+
+@retry(
+    stop=stop_after_attempt(5),
+    wait=wait_random_exponential(multiplier=0.3, max=5),
+    retry=retry_if_exception(_is_transient),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True
+)
+def _refresh(client_id: str, client_secret: str, refresh_token: str) -> Tuple[str, float]:
+    """Exchange the refresh token for a new access token."""
+    response = SESSION.post(
+        TOKEN_URL,
+        data=_REFRESH_BASE | {
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "refresh_token": refresh_token,
+        },
+    )
+    response.raise_for_status()
+
+    payload = response.json()
+    expires_at = time.monotonic() + int(payload.get("expires_in", 3600))
+    logger.info("Refreshed Google access token")
+    return payload["access_token"], expires_at
+
+
+def get_access_token(
+    client_id: str,
+    client_secret: str,
+    refresh_token: str,
+    scopes: Tuple[str, ...] = GOOGLE_SCOPES
+) -> Tuple[str, float]:
+    """
+    Return a valid access token, refreshing only when the cached one is about to expire.
+
+    Args:
+        client_id: OAuth client ID
+        client_secret: OAuth client secret
+        refresh_token: Long-lived refresh token
+        scopes: Scopes the refresh token was granted for
+
+    Returns:
+        Tuple of (access_token, expires_at) where expires_at is a time.monotonic() value
+    """
+    key = _cache_key(client_id, scopes)
+
+    # Concurrent callers collapse to a single refresh
+    with _lock:
+        cached = _TOKENS.get(key)
+        if cached and time.monotonic() < cached[1] - REFRESH_MARGIN_SECONDS:
+            return cached
+
+        # A previous process may have left a still-valid token on disk
+        stored = token_store.load(refresh_token)
+        if stored:
+            access_token, wall_expires_at = stored
+            expires_at = from_wall_clock(wall_expires_at)
+            if time.monotonic() < expires_at - REFRESH_MARGIN_SECONDS:
+                _TOKENS[key] = (access_token, expires_at)
+                return _TOKENS[key]
+
+        token = _refresh(client_id, client_secret, refresh_token)
+        _TOKENS[key] = token
+        token_store.save(token[0], to_wall_clock(token[1]), refresh_token)
+        return token
+
+
+def force_refresh(
+    client_id: str,
+    client_secret: str,
+    refresh_token: str,
+    scopes: Tuple[str, ...] = GOOGLE_SCOPES
+) -> Tuple[str, float]:
+    """Refresh the access token unconditionally and replace the cached entry."""
+    key = _cache_key(client_id, scopes)
+
+    # The request (and its retries) runs unlocked so get_access_token keeps serving
+    # the still-valid cached token meanwhile; only the swap is serialized
+    token = _refresh(client_id, client_secret, refresh_token)
+    with _lock:
+        _TOKENS[key] = token
+        token_store.save(token[0], to_wall_clock(token[1]), refresh_token)
+    return token
+
+
+def seconds_until_expiry(client_id: str, scopes: Tuple[str, ...] = GOOGLE_SCOPES) -> float:
+    """Seconds until the cached access token expires, or 0 if none is cached."""
+    cached = _TOKENS.get(_cache_key(client_id, scopes))
+    if not cached:
+        return 0.0
+    return max(0.0, cached[1] - time.monotonic())
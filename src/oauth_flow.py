@@ -0,0 +1,233 @@
+"""
+One-off helper for obtaining GOOGLE_REFRESH_TOKEN.
+
+Runs the OAuth authorization code flow against a loopback redirect, so the
+authorization code is captured automatically instead of being pasted by hand:
+
+    python -m src.oauth_flow
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import secrets
+import sys
+import threading
+import time
+import webbrowser
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlencode, urlparse
+
+import httpx
+from dotenv import load_dotenv
+
+from .oauth_cache import GOOGLE_SCOPES, TOKEN_URL
+
+AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
+TOKENINFO_URL = "https://oauth2.googleapis.com/tokeninfo"
+DRIVE_ABOUT_URL = "https://www.googleapis.com/drive/v3/about"
+CREDENTIALS_CONSOLE_URL = "https://console.cloud.google.com/apis/credentials"
+
+# webbrowser.open can block for a long time on WSL/headless hosts instead of failing
+BROWSER_OPEN_TIMEOUT_SECONDS = 1.5
+
+# Fixed part of the authorization code exchange
+_AUTH_CODE_BASE = {"grant_type": "authorization_code"}
+
+# How long to wait for the browser to reach the loopback server before asking for the URL
+LOOPBACK_TIMEOUT_SECONDS = 300
+
+# Everything except client_id, redirect_uri and the PKCE challenge is fixed
+_SCOPE_STRING = " ".join(GOOGLE_SCOPES)
+_STATIC_AUTH_QS = urlencode({
+    "scope": _SCOPE_STRING,
+    "response_type": "code",
+    "access_type": "offline",
+    "prompt": "consent",
+    "code_challenge_method": "S256",
+})
+
+
+class _CallbackHandler(BaseHTTPRequestHandler):
+    """Captures the authorization code from Google's redirect."""
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        self.server.auth_code = params.get("code", [None])[0]
+        self.server.auth_error = params.get("error", [None])[0]
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+        message = "Authorization complete." if self.server.auth_code else "Authorization failed."
+        self.wfile.write(f"<html><body><p>{message} You can close this tab.</p></body></html>".encode())
+
+    def log_message(self, format, *args):
+        """Keep the terminal output clean."""
+
+
+def _pkce_pair() -> Tuple[str, str]:
+    """Generate a PKCE (RFC 7636) code verifier and its S256 challenge."""
+    verifier = secrets.token_urlsafe(64)
+    digest = hashlib.sha256(verifier.encode()).digest()
+    challenge = base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+    return verifier, challenge
+
+
+def _wait_for_code(server: HTTPServer) -> None:
+    """Serve the loopback redirect until Google delivers a code or an error, or time runs out."""
+    server.timeout = 1.0
+    deadline = time.monotonic() + LOOPBACK_TIMEOUT_SECONDS
+    try:
+        # Ignore stray requests (e.g. favicon) until Google redirects back
+        while server.auth_code is None and server.auth_error is None and time.monotonic() < deadline:
+            server.handle_request()
+    finally:
+        server.server_close()
+
+
+def _open_browser(url: str) -> None:
+    """Try to open the browser without letting a broken desktop setup stall the flow."""
+    # A daemon thread, unlike an executor worker, is not joined at interpreter exit
+    opener = threading.Thread(target=webbrowser.open, args=(url,), daemon=True)
+    opener.start()
+    opener.join(BROWSER_OPEN_TIMEOUT_SECONDS)
+
+
+def _read_pasted_code() -> Optional[str]:
+    """Fallback for browsers that cannot reach this machine's loopback interface."""
+    pasted = input("Paste the URL your browser was redirected to (or just the code): ").strip()
+    if "?" not in pasted:
+        return pasted or None
+    return parse_qs(urlparse(pasted).query).get("code", [None])[0]
+
+
+async def _preflight(auth_url: str) -> Optional[str]:
+    """
+    Ask Google to validate the authorization request before involving the user.
+
+    Returns:
+        A short description of the rejection, or None if the request looks valid
+        (or could not be checked)
+    """
+    try:
+        async with httpx.AsyncClient(http2=True, timeout=httpx.Timeout(5.0, connect=3.05)) as client:
+            response = await client.get(auth_url, follow_redirects=False)
+    except httpx.HTTPError as e:
+        print(f"Skipping authorization preflight: {e}")
+        return None
+
+    # Invalid clients and unregistered redirect URIs get an error page instead of the sign-in redirect
+    location = response.headers.get("location", "")
+    if response.status_code >= 400:
+        return f"HTTP {response.status_code}"
+    if "/signin/oauth/error" in location:
+        return "redirected to Google's OAuth error page"
+    return None
+
+
+async def run_loopback_flow(client_id: str, client_secret: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Authorize in the browser, exchange the code for tokens and verify them.
+
+    Args:
+        client_id: OAuth client ID (Desktop app type)
+        client_secret: OAuth client secret; omitted from the exchange when not set,
+            leaving PKCE to prove possession of the authorization request
+
+    Returns:
+        Token response from Google, including refresh_token, plus the granted
+        scopes and the Drive account under "verification"
+    """
+    # Port 0 lets the OS pick a free port; Google accepts any loopback port for desktop clients
+    server = HTTPServer(("127.0.0.1", 0), _CallbackHandler)
+    server.auth_code = None
+    server.auth_error = None
+    redirect_uri = f"http://127.0.0.1:{server.server_address[1]}/callback"
+    verifier, challenge = _pkce_pair()
+
+    auth_url = (
+        f"{AUTH_URL}?client_id={quote(client_id, safe='')}"
+        f"&redirect_uri={quote(redirect_uri, safe='')}"
+        f"&code_challenge={challenge}&{_STATIC_AUTH_QS}"
+    )
+
+    error = await _preflight(auth_url)
+    if error:
+        server.server_close()
+        print(f"Google rejected the authorization request ({error}).")
+        print(f"Check that {client_id} is a Desktop app client and that its redirect URIs allow")
+        print(f"{redirect_uri}: {CREDENTIALS_CONSOLE_URL}")
+        sys.exit(2)
+
+    print(f"Open this URL to authorize:\n\n{auth_url}\n")
+    _open_browser(auth_url)
+
+    await asyncio.to_thread(_wait_for_code, server)
+
+    if server.auth_error:
+        raise RuntimeError(f"Authorization denied: {server.auth_error}")
+    if server.auth_code is None:
+        server.auth_code = _read_pasted_code()
+        if not server.auth_code:
+            raise RuntimeError("No authorization code received")
+
+    token_data = _AUTH_CODE_BASE | {
+        "code": server.auth_code,
+        "client_id": client_id,
+        "code_verifier": verifier,
+        "redirect_uri": redirect_uri,
+    }
+    if client_secret:
+        token_data["client_secret"] = client_secret
+
+    # HTTP/2 lets the two verification requests share the exchange's connection
+    async with httpx.AsyncClient(http2=True, timeout=httpx.Timeout(10.0, connect=3.05)) as client:
+        response = await client.post(TOKEN_URL, data=token_data)
+        response.raise_for_status()
+        tokens = response.json()
+
+        # Both checks only need the fresh access token, so run them together
+        access_token = tokens["access_token"]
+        tokeninfo, about = await asyncio.gather(
+            client.get(TOKENINFO_URL, params={"access_token": access_token}),
+            client.get(
+                DRIVE_ABOUT_URL,
+                params={"fields": "user(emailAddress)"},
+                headers={"Authorization": f"Bearer {access_token}"}
+            ),
+        )
+        tokeninfo.raise_for_status()
+        about.raise_for_status()
+
+    tokens["verification"] = {
+        "scopes": tokeninfo.json().get("scope", "").split(),
+        "account": about.json().get("user", {}).get("emailAddress"),
+    }
+    return tokens
+
+
+def main():
+    """Print a refresh token for the configured OAuth client."""
+    load_dotenv()
+    client_id = os.getenv("GOOGLE_CLIENT_ID")
+    client_secret = os.getenv("GOOGLE_CLIENT_SECRET")
+    if not client_id:
+        print("GOOGLE_CLIENT_ID must be set")
+        sys.exit(1)
+
+    tokens = asyncio.run(run_loopback_flow(client_id, client_secret))
+    refresh_token = tokens.get("refresh_token")
+    if not refresh_token:
+        print("Google did not return a refresh token; revoke the app's access and retry")
+        sys.exit(1)
+
+    verification = tokens["verification"]
+    print(f"Authorized as {verification['account']} with scopes: {', '.join(verification['scopes'])}")
+    print(f"GOOGLE_REFRESH_TOKEN={refresh_token}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,79 @@
 """External API service integrations."""
 
+import threading
+from functools import lru_cache
+from typing import Optional
+
 from .pinecone_service import PineconeService
 from .perplexity_service import PerplexityService
 from .openai_service import OpenAIService
 from .openrouter_service import OpenRouterService
 from .google_service import GoogleService
+from ..http_client import close_async_client
+
+
+# Services hold API clients and credentials, so one instance per process is reused
+@lru_cache(maxsize=1)
+def get_perplexity_service() -> PerplexityService:
+    return PerplexityService()
+
+
+@lru_cache(maxsize=1)
+def get_openai_service() -> OpenAIService:
+    return OpenAIService()
+
+
+@lru_cache(maxsize=1)
+def get_openrouter_service() -> OpenRouterService:
+    return OpenRouterService()
+
+
+# Built from worker threads (asyncio.to_thread), where lru_cache could run the
+# constructor twice on a cold start; double-checked locking guarantees one instance.
+# Pinecone's instance also owns the query cache, so a duplicate would split it.
+_pinecone_service: Optional[PineconeService] = None
+_pinecone_lock = threading.Lock()
+_google_service: Optional[GoogleService] = None
+_google_lock = threading.Lock()
+
+
+def get_pinecone_service() -> PineconeService:
+    global _pinecone_service
+    if _pinecone_service is None:
+        with _pinecone_lock:
+            if _pinecone_service is None:
+                _pinecone_service = PineconeService()
+    return _pinecone_service
+
+
+def get_google_service() -> GoogleService:
+    global _google_service
+    if _google_service is None:
+        with _google_lock:
+            if _google_service is None:
+                _google_service = GoogleService()
+    return _google_service
+
+
+async def close_services() -> None:
+    """Close the connection pool shared by the HTTP-based services."""
+    # These services hold the pooled client; drop them so none keeps a closed one
+    get_perplexity_service.cache_clear()
+    get_openai_service.cache_clear()
+    get_openrouter_service.cache_clear()
+    await close_async_client()
+
 
 __all__ = [
     "PineconeService",
     "PerplexityService", 
     "OpenAIService",
     "OpenRouterService",
-    "GoogleService"
+    "GoogleService",
+    "get_pinecone_service",
+    "get_perplexity_service",
+    "get_openai_service",
+    "get_openrouter_service",
+    "get_google_service",
+    "close_services"
 ]
@@ -3,28 +3,45 @@ OpenAI service for embeddings and content strategy generation.
 Handles text embeddings and strategic planning for content creation.
 """
 
+import asyncio
 import logging
+import orjson
 from typing import Dict, Any
 from typing import List  # Separate import for Railway compatibility
 from openai import AsyncOpenAI
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, stop_after_attempt, wait_random_exponential
 
-from ..config import settings
-from ..models.content import ContentStrategy, Section, SEOStrategy, ContentRestrictions
+from ..config import get_settings
+from ..http_client import get_async_client
+from ..models.content import ContentStrategy
+from ..utils.embedding_cache import embedding_cache
+from ..utils.errors import log_and_reraise, wait_retry_after
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of inputs the embeddings endpoint accepts per request
+EMBEDDING_BATCH_SIZE = 2048
+
 
 class OpenAIService:
     """Service for interacting with OpenAI API."""
     
     def __init__(self):
         """Initialize OpenAI client."""
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        settings = get_settings()
+        # Rides on the process-wide HTTP/2 pool; the SDK sends its timeout with each request
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            timeout=600.0,
+            http_client=get_async_client()
+        )
         self.embedding_model = settings.openai_embedding_model
         self.embedding_dimensions = settings.embedding_dimensions
+        # Bounds in-flight requests so bursts don't trip OpenAI rate limits
+        self._semaphore = asyncio.Semaphore(settings.openai_max_concurrency)
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    @retry(stop=stop_after_attempt(3), wait=wait_retry_after(wait_random_exponential(multiplier=1, min=4, max=10)))
+    @log_and_reraise("Error creating embeddings")
     async def create_embeddings(self, text: str) -> List[float]:
         """
         Create embeddings for text using OpenAI's embedding model.
@@ -35,22 +52,77 @@ class OpenAIService:
         Returns:
             List of embedding values
         """
-        try:
+        cached = embedding_cache.get(self.embedding_model, self.embedding_dimensions, text)
+        if cached is not None:
+            return cached
+        
+        async with self._semaphore:
             response = await self.client.embeddings.create(
                 model=self.embedding_model,
                 input=text,
                 dimensions=self.embedding_dimensions
             )
+        
+        embedding = response.data[0].embedding
+        embedding_cache.put(self.embedding_model, self.embedding_dimensions, text, embedding)
+        logger.debug("Created embedding for text of length %s", len(text))
+        return embedding
+    
+    async def create_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Create embeddings for several texts with as few API requests as possible.
+        
+        Args:
+            texts: Texts to embed; cache misses are split into requests of at most EMBEDDING_BATCH_SIZE
             
-            embedding = response.data[0].embedding
-            logger.debug(f"Created embedding for text of length {len(text)}")
-            return embedding
-            
-        except Exception as e:
-            logger.error(f"Error creating embeddings: {e}")
-            raise
+        Returns:
+            Embedding vectors in the same order as the input texts
+        """
+        embeddings = [
+            embedding_cache.get(self.embedding_model, self.embedding_dimensions, text)
+            for text in texts
+        ]
+        # Only distinct uncached texts are sent to the API
+        misses = list(dict.fromkeys(
+            text for text, embedding in zip(texts, embeddings) if embedding is None
+        ))
+        if not misses:
+            return embeddings
+        
+        chunks = [
+            misses[start:start + EMBEDDING_BATCH_SIZE]
+            for start in range(0, len(misses), EMBEDDING_BATCH_SIZE)
+        ]
+        # Chunks are retried independently and run under the shared semaphore; once one
+        # fails for good, the others are cancelled rather than spending quota
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(self._create_embeddings_chunk(chunk)) for chunk in chunks]
+        
+        fetched = dict(zip(misses, (embedding for task in tasks for embedding in task.result())))
+        for text, embedding in fetched.items():
+            embedding_cache.put(self.embedding_model, self.embedding_dimensions, text, embedding)
+        return [
+            embedding if embedding is not None else fetched[text]
+            for text, embedding in zip(texts, embeddings)
+        ]
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    @retry(stop=stop_after_attempt(3), wait=wait_retry_after(wait_random_exponential(multiplier=1, min=4, max=10)))
+    @log_and_reraise("Error creating batch embeddings")
+    async def _create_embeddings_chunk(self, texts: List[str]) -> List[List[float]]:
+        """Embed up to EMBEDDING_BATCH_SIZE texts in a single API request."""
+        async with self._semaphore:
+            response = await self.client.embeddings.create(
+                model=self.embedding_model,
+                input=texts,
+                dimensions=self.embedding_dimensions
+            )
+        
+        embeddings = [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        logger.debug("Created %s embeddings in one request", len(embeddings))
+        return embeddings
+    
+    @retry(stop=stop_after_attempt(3), wait=wait_retry_after(wait_random_exponential(multiplier=1, min=4, max=10)))
+    @log_and_reraise("Error creating content strategy")
     async def create_content_strategy(
         self,
         topic: str,
@@ -78,13 +150,13 @@ class OpenAIService:
         Returns:
             Complete content strategy
         """
-        try:
-            system_prompt = self._get_strategy_system_prompt()
-            user_prompt = self._build_strategy_user_prompt(
-                topic, main_keywords, secondary_keywords, target_word_count,
-                negative_keywords, medical_facts, cultural_context, approved_structure
-            )
-            
+        system_prompt = self._get_strategy_system_prompt()
+        user_prompt = self._build_strategy_user_prompt(
+            topic, main_keywords, secondary_keywords, target_word_count,
+            negative_keywords, medical_facts, cultural_context, approved_structure
+        )
+        
+        async with self._semaphore:
             response = await self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
@@ -95,22 +167,23 @@ class OpenAIService:
                 max_tokens=2000,
                 response_format={"type": "json_object"}
             )
-            
-            result = response.choices[0].message.content
-            strategy_data = eval(result)  # Parse JSON response
-            
-            # Convert to Pydantic model
-            strategy = self._parse_strategy_response(strategy_data)
-            
-            logger.info(f"Created content strategy for topic: {topic}")
-            return strategy
-            
-        except Exception as e:
-            logger.error(f"Error creating content strategy: {e}")
-            raise
+        
+        result = response.choices[0].message.content
+        strategy_data = orjson.loads(result)  # JSON mode output; eval() rejects true/false/null
+        
+        # Convert to Pydantic model
+        strategy = self._parse_strategy_response(strategy_data)
+        
+        logger.info("Created content strategy for topic: %s", topic)
+        return strategy
     
     def _get_strategy_system_prompt(self) -> str:
-        """Get the system prompt for content strategy generation."""
+        """
+        Get the system prompt for content strategy generation.
+        
+        Contains everything that does not vary per request, so the byte-identical
+        prefix qualifies for OpenAI's automatic prompt caching.
+        """
         return """
         You are an expert content strategist for medical blog articles, specializing in 
         Greek orthopedic surgery content. Your task is to create comprehensive content 
@@ -126,62 +199,31 @@ class OpenAIService:
         
         Always respond with valid JSON containing all required fields.
         Focus on educational value and building trust through expertise demonstration.
-        """
-    
-    def _build_strategy_user_prompt(
-        self,
-        topic: str,
-        main_keywords: str,
-        secondary_keywords: str,
-        target_word_count: int,
-        negative_keywords: str,
-        medical_facts: str,
-        cultural_context: str,
-        approved_structure: List[Dict[str, Any]]
-    ) -> str:
-        """Build the user prompt for strategy generation."""
-        return f"""
-        Create a comprehensive content strategy for a Greek orthopedic blog article.
-        
-        TOPIC: {topic}
-        MAIN KEYWORDS: {main_keywords}
-        SECONDARY KEYWORDS: {secondary_keywords}
-        TARGET WORD COUNT: {target_word_count}
-        AVOID KEYWORDS: {negative_keywords}
-        
-        MEDICAL RESEARCH CONTEXT:
-        {medical_facts[:1500]}  # Truncate to fit in context
-        
-        CULTURAL CONTEXT:
-        {cultural_context[:800]}
-        
-        APPROVED STRUCTURES:
-        {str(approved_structure)[:500]}
         
         Generate a JSON response with the following structure:
-        {{
+        {
             "h1_title": "Title with main keyword in Greek",
             "content_sections": [
-                {{
+                {
                     "title": "Section title",
                     "content_points": ["Point 1", "Point 2"],
                     "target_words": 300,
                     "medical_focus": ["concept1", "concept2"]
-                }}
+                }
             ],
-            "seo_strategy": {{
+            "seo_strategy": {
                 "main_keyword_placement": ["H1", "first paragraph", "conclusion"],
                 "secondary_distribution": ["section 2", "section 4"]
-            }},
-            "content_restrictions": {{
+            },
+            "content_restrictions": {
                 "avoid": ["emotional stories", "first person voice"],
                 "alternatives": ["evidence-based examples", "third person voice"],
                 "voice_requirements": ["Γ' ενικό throughout", "professional tone"]
-            }},
+            },
             "medical_focus": ["key medical concept 1", "key medical concept 2"],
-            "target_word_count": {target_word_count},
+            "target_word_count": <the TARGET WORD COUNT given by the user>,
             "cultural_context": "Brief summary of cultural considerations"
-        }}
+        }
         
         Ensure:
         1. H1 title includes main keyword naturally in Greek
@@ -192,49 +234,42 @@ class OpenAIService:
         6. Medical focus aligns with the research provided
         """
     
+    def _build_strategy_user_prompt(
+        self,
+        topic: str,
+        main_keywords: str,
+        secondary_keywords: str,
+        target_word_count: int,
+        negative_keywords: str,
+        medical_facts: str,
+        cultural_context: str,
+        approved_structure: List[Dict[str, Any]]
+    ) -> str:
+        """Build the user prompt for strategy generation (research context first, request details last)."""
+        return f"""
+        MEDICAL RESEARCH CONTEXT:
+        {medical_facts[:1500]}
+        
+        CULTURAL CONTEXT:
+        {cultural_context[:800]}
+        
+        APPROVED STRUCTURES:
+        {str(approved_structure)[:500]}
+        
+        Create a comprehensive content strategy for a Greek orthopedic blog article.
+        
+        TOPIC: {topic}
+        MAIN KEYWORDS: {main_keywords}
+        SECONDARY KEYWORDS: {secondary_keywords}
+        TARGET WORD COUNT: {target_word_count}
+        AVOID KEYWORDS: {negative_keywords}
+        """
+    
+    @log_and_reraise("Error parsing strategy response")
     def _parse_strategy_response(self, strategy_data: Dict[str, Any]) -> ContentStrategy:
         """Parse the strategy response into a Pydantic model."""
-        try:
-            # Parse sections
-            sections = []
-            for section_data in strategy_data.get("content_sections", []):
-                section = Section(
-                    title=section_data["title"],
-                    content_points=section_data["content_points"],
-                    target_words=section_data.get("target_words"),
-                    medical_focus=section_data.get("medical_focus")
-                )
-                sections.append(section)
-            
-            # Parse SEO strategy
-            seo_strategy = SEOStrategy(
-                main_keyword_placement=strategy_data["seo_strategy"]["main_keyword_placement"],
-                secondary_distribution=strategy_data["seo_strategy"]["secondary_distribution"]
-            )
-            
-            # Parse content restrictions
-            restrictions = ContentRestrictions(
-                avoid=strategy_data["content_restrictions"]["avoid"],
-                alternatives=strategy_data["content_restrictions"]["alternatives"],
-                voice_requirements=strategy_data["content_restrictions"]["voice_requirements"]
-            )
-            
-            # Create complete strategy
-            strategy = ContentStrategy(
-                h1_title=strategy_data["h1_title"],
-                content_sections=sections,
-                seo_strategy=seo_strategy,
-                content_restrictions=restrictions,
-                medical_focus=strategy_data["medical_focus"],
-                target_word_count=strategy_data["target_word_count"],
-                cultural_context=strategy_data.get("cultural_context")
-            )
-            
-            return strategy
-            
-        except Exception as e:
-            logger.error(f"Error parsing strategy response: {e}")
-            raise
+        # Nested sections, SEO strategy and restrictions are validated in one pass
+        return ContentStrategy.model_validate(strategy_data)
     
     async def create_query_embedding(self, topic: str, keywords: str) -> List[float]:
         """
@@ -3,15 +3,19 @@ OpenRouter service for content generation and evaluation.
 Handles article generation and quality evaluation using advanced models.
 """
 
+import asyncio
 import logging
 import httpx
+import orjson
 from typing import Dict, Any, Optional
 from typing import List  # Separate import for Railway compatibility
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, stop_after_attempt, wait_random_exponential
 
-from ..config import settings
+from ..config import get_settings
+from ..http_client import get_async_client
 from ..models.content import ContentStrategy, Article
-from ..models.evaluation import Evaluation
+from ..models.evaluation import Evaluation, ScoreBreakdown
+from ..utils.errors import log_and_reraise, wait_retry_after
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +25,7 @@ class OpenRouterService:
     
     def __init__(self):
         """Initialize OpenRouter service."""
+        settings = get_settings()
         self.base_url = "https://openrouter.ai/api/v1"
         self.model = settings.openrouter_model
         self.headers = {
@@ -29,8 +34,15 @@ class OpenRouterService:
             "HTTP-Referer": "https://chloros.gr",
             "X-Title": "Chloros Blog MCP Server"
         }
+        # Bounds in-flight requests so bursts don't trip OpenRouter rate limits
+        self._semaphore = asyncio.Semaphore(settings.openrouter_max_concurrency)
+        # Keep-alive pool shared with the other API services; the timeout travels per request
+        self._client = get_async_client()
+        # Generation is streamed, so this bounds the silence between chunks rather than
+        # the whole article; OpenRouter sends keep-alive comments while the model thinks
+        self.timeout = httpx.Timeout(60.0, connect=3.05)
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    @retry(stop=stop_after_attempt(3), wait=wait_retry_after(wait_random_exponential(multiplier=1, min=4, max=10)))
     async def generate_complete_article(
         self,
         strategy: ContentStrategy,
@@ -60,25 +72,16 @@ class OpenRouterService:
                 strategy, medical_facts, cultural_context, retry_count, previous_evaluation
             )
             
-            async with httpx.AsyncClient(timeout=300.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=self.headers,
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": user_prompt}
-                        ],
-                        "temperature": 0.4,
-                        "max_tokens": 30000,
-                        "stream": False
-                    }
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                content = result["choices"][0]["message"]["content"]
+            async with self._semaphore:
+                content = await self._stream_completion({
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": self._system_content(system_prompt)},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    "temperature": 0.4,
+                    "max_tokens": 30000
+                })
                 
                 # Create Article object
                 article = Article(
@@ -96,16 +99,54 @@ class OpenRouterService:
                 # Calculate word count
                 article.calculate_word_count()
                 
-                logger.info(f"Generated article with {article.word_count} words")
+                logger.info("Generated article with %s words", article.word_count)
                 return article
                 
         except httpx.TimeoutException:
             logger.error("Timeout during article generation")
             raise
         except Exception as e:
-            logger.error(f"Error generating article: {e}")
+            logger.error("Error generating article: %s", e)
             raise
     
+    async def _stream_completion(self, payload: Dict[str, Any]) -> str:
+        """
+        Run a chat completion as a server-sent event stream and return the full text.
+        
+        Args:
+            payload: Request body without the "stream" flag
+            
+        Returns:
+            Concatenated content of every delta
+        """
+        parts: List[str] = []
+        async with self._client.stream(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            timeout=self.timeout,
+            headers=self.headers,
+            json=payload | {"stream": True}
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                # Blank separators and ": OPENROUTER PROCESSING" keep-alive comments carry no data
+                if not line.startswith("data: "):
+                    continue
+                data = line[6:]
+                if data == "[DONE]":
+                    break
+                
+                chunk = orjson.loads(data)
+                # Errors after the 200 status arrive as an event instead of an HTTP error
+                if "error" in chunk:
+                    raise RuntimeError(f"OpenRouter stream error: {chunk['error'].get('message', chunk['error'])}")
+                if chunk.get("choices"):
+                    delta = chunk["choices"][0].get("delta", {}).get("content")
+                    if delta:
+                        parts.append(delta)
+        
+        return "".join(parts)
+    
     def _get_generation_system_prompt(self, patterns: Dict[str, Any]) -> str:
         """Get the comprehensive system prompt for article generation."""
         return f"""
@@ -163,6 +204,17 @@ class OpenRouterService:
         Δημιούργησε ΠΛΗΡΕΣ άρθρο σε μία απάντηση, όχι τμήματα.
         """
     
+    def _system_content(self, system_prompt: str) -> Any:
+        """
+        Wrap the system prompt for the configured model.
+        
+        Anthropic models only cache prompts that carry an explicit cache_control
+        breakpoint; other providers cache identical prefixes automatically.
+        """
+        if not self.model.startswith("anthropic/"):
+            return system_prompt
+        return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+    
     def _build_generation_user_prompt(
         self,
         strategy: ContentStrategy,
@@ -172,7 +224,14 @@ class OpenRouterService:
         previous_evaluation: Optional[Evaluation]
     ) -> str:
         """Build the user prompt for article generation."""
+        # Research context goes first so the prompt prefix stays stable across retries
         base_prompt = f"""
+        ΙΑΤΡΙΚΑ ΔΕΔΟΜΕΝΑ (χρησιμοποίησε για ακρίβεια):
+        {medical_facts[:2000]}
+        
+        ΠΟΛΙΤΙΣΜΙΚΟ ΠΛΑΙΣΙΟ:
+        {cultural_context[:800]}
+        
         Δημιούργησε πλήρες άρθρο blog βάσει της παρακάτω στρατηγικής:
         
         ΣΤΡΑΤΗΓΙΚΗ ΠΕΡΙΕΧΟΜΕΝΟΥ:
@@ -190,15 +249,9 @@ class OpenRouterService:
            Ιατρική εστίαση: {', '.join(section.medical_focus or [])}
         """
         
-        # Add medical facts
+        # Add SEO strategy and restrictions
         base_prompt += f"""
         
-        ΙΑΤΡΙΚΑ ΔΕΔΟΜΕΝΑ (χρησιμοποίησε για ακρίβεια):
-        {medical_facts[:2000]}
-        
-        ΠΟΛΙΤΙΣΜΙΚΟ ΠΛΑΙΣΙΟ:
-        {cultural_context[:800]}
-        
         SEO ΣΤΡΑΤΗΓΙΚΗ:
         - Κύρια λέξη-κλειδί: {', '.join(strategy.seo_strategy.main_keyword_placement)}
         - Δευτερεύουσες: {', '.join(strategy.seo_strategy.secondary_distribution)}
@@ -250,7 +303,8 @@ class OpenRouterService:
         
         return sections
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    @retry(stop=stop_after_attempt(3), wait=wait_retry_after(wait_random_exponential(multiplier=1, min=4, max=10)))
+    @log_and_reraise("Error evaluating article quality")
     async def evaluate_article_quality(
         self,
         complete_article: str,
@@ -272,41 +326,38 @@ class OpenRouterService:
         Returns:
             Comprehensive evaluation results
         """
-        try:
-            system_prompt = self._get_evaluation_system_prompt(scoring_matrix)
-            user_prompt = self._build_evaluation_user_prompt(
-                complete_article, topic, word_count_target
+        system_prompt = self._get_evaluation_system_prompt(scoring_matrix)
+        user_prompt = self._build_evaluation_user_prompt(
+            complete_article, topic, word_count_target
+        )
+        
+        async with self._semaphore:
+            response = await self._client.post(
+                f"{self.base_url}/chat/completions",
+                timeout=120.0,
+                headers=self.headers,
+                json={
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": self._system_content(system_prompt)},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    "temperature": 0.1,  # Very deterministic for evaluation
+                    "max_tokens": 3000,
+                    "response_format": {"type": "json_object"}
+                }
             )
+            response.raise_for_status()
             
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=self.headers,
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": user_prompt}
-                        ],
-                        "temperature": 0.1,  # Very deterministic for evaluation
-                        "max_tokens": 3000,
-                        "response_format": {"type": "json_object"}
-                    }
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                evaluation_data = eval(result["choices"][0]["message"]["content"])
-                
-                # Parse into Evaluation object
-                evaluation = self._parse_evaluation_response(evaluation_data, word_count_target)
-                
-                logger.info(f"Evaluated article: {evaluation.total_score}/100")
-                return evaluation
-                
-        except Exception as e:
-            logger.error(f"Error evaluating article quality: {e}")
-            raise
+            # JSON mode returns JSON, not Python literals; orjson also avoids eval's compile step
+            result = orjson.loads(response.content)
+            evaluation_data = orjson.loads(result["choices"][0]["message"]["content"])
+            
+            # Parse into Evaluation object
+            evaluation = self._parse_evaluation_response(evaluation_data, word_count_target)
+            
+            logger.info("Evaluated article: %s/100", evaluation.total_score)
+            return evaluation
     
     def _get_evaluation_system_prompt(self, scoring_matrix: Dict[str, Any]) -> str:
         """Get the system prompt for article evaluation."""
@@ -382,11 +433,7 @@ class OpenRouterService:
     
     def _parse_evaluation_response(self, data: Dict[str, Any], target_words: int) -> Evaluation:
         """Parse evaluation response into Evaluation object."""
-        from ..models.evaluation import ScoreBreakdown
-        
-        # Calculate word count and deviation
         actual_words = data.get("word_count_actual", 0)
-        deviation = ((actual_words - target_words) / target_words) * 100 if target_words > 0 else 0
         
         # Create score breakdown
         score_breakdown = ScoreBreakdown(
@@ -402,7 +449,6 @@ class OpenRouterService:
             score_breakdown=score_breakdown,
             word_count_actual=actual_words,
             word_count_target=target_words,
-            word_count_deviation_percent=deviation,
             critical_issues=data.get("critical_issues", []),
             improvements_needed=data.get("improvements_needed", []),
             passes_quality_gate=False  # Will be calculated
@@ -3,13 +3,16 @@ Perplexity service for cultural context research.
 Handles queries about Greek healthcare culture and patient perceptions.
 """
 
+import asyncio
 import logging
 import httpx
 from typing import Dict, Any
 from typing import List  # Separate import for Railway compatibility
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, stop_after_attempt, wait_random_exponential
 
-from ..config import settings
+from ..config import get_settings
+from ..http_client import get_async_client
+from ..utils.errors import log_and_reraise, wait_retry_after
 
 logger = logging.getLogger(__name__)
 
@@ -19,14 +22,20 @@ class PerplexityService:
     
     def __init__(self):
         """Initialize Perplexity service."""
+        settings = get_settings()
         self.base_url = "https://api.perplexity.ai"
         self.model = "sonar-pro"
         self.headers = {
             "Authorization": f"Bearer {settings.perplexity_api_key}",
             "Content-Type": "application/json"
         }
+        # Bounds in-flight requests so bursts don't trip Perplexity rate limits
+        self._semaphore = asyncio.Semaphore(settings.perplexity_max_concurrency)
+        # Keep-alive pool shared with the other API services; the timeout travels per request
+        self._client = get_async_client()
+        self.timeout = httpx.Timeout(900.0, connect=3.05)
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    @retry(stop=stop_after_attempt(3), wait=wait_retry_after(wait_random_exponential(multiplier=1, min=4, max=10)))
     async def research_cultural_context(self, topic: str) -> Dict[str, Any]:
         """
         Research Greek cultural context for a medical topic.
@@ -41,9 +50,10 @@ class PerplexityService:
             # Construct culturally-focused query
             query = self._build_cultural_query(topic)
             
-            async with httpx.AsyncClient(timeout=900.0) as client:
-                response = await client.post(
+            async with self._semaphore:
+                response = await self._client.post(
                     f"{self.base_url}/chat/completions",
+                    timeout=self.timeout,
                     headers=self.headers,
                     json={
                         "model": self.model,
@@ -69,14 +79,14 @@ class PerplexityService:
                 # Parse the response into structured data
                 parsed_result = self._parse_cultural_response(content)
                 
-                logger.info(f"Retrieved cultural context for topic: {topic}")
+                logger.info("Retrieved cultural context for topic: %s", topic)
                 return parsed_result
                 
         except httpx.TimeoutException:
-            logger.error(f"Timeout while researching cultural context for: {topic}")
+            logger.error("Timeout while researching cultural context for: %s", topic)
             raise
         except Exception as e:
-            logger.error(f"Error researching cultural context: {e}")
+            logger.error("Error researching cultural context: %s", e)
             raise
     
     def _build_cultural_query(self, topic: str) -> str:
@@ -172,13 +182,14 @@ class PerplexityService:
             }
             
         except Exception as e:
-            logger.warning(f"Failed to parse cultural response, using raw content: {e}")
+            logger.warning("Failed to parse cultural response, using raw content: %s", e)
             return {
                 'cultural_insights': content,
                 'patient_concerns': ["Cultural considerations for Greek patients"],
                 'healthcare_context': "Greek healthcare cultural context"
             }
     
+    @log_and_reraise("Error researching patient communication")
     async def research_patient_communication(self, topic: str, target_audience: str = "middle-aged adults") -> Dict[str, Any]:
         """
         Research effective communication strategies for Greek patients.
@@ -190,51 +201,47 @@ class PerplexityService:
         Returns:
             Communication strategies and preferences
         """
-        try:
-            query = f"""
-            How should a Greek orthopedic surgeon communicate about {topic} with {target_audience}?
+        query = f"""
+        How should a Greek orthopedic surgeon communicate about {topic} with {target_audience}?
+        
+        Focus on:
+        1. Preferred communication style (direct vs indirect)
+        2. Level of medical detail patients expect
+        3. Role of family in discussions
+        4. Addressing common misconceptions
+        5. Building trust and credibility
+        6. Cultural sensitivities to avoid
+        7. Effective persuasion techniques in Greek culture
+        """
+        
+        async with self._semaphore:
+            response = await self._client.post(
+                f"{self.base_url}/chat/completions",
+                timeout=self.timeout,
+                headers=self.headers,
+                json={
+                    "model": self.model,
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "You are an expert in Greek healthcare communication and patient relations."
+                        },
+                        {
+                            "role": "user",
+                            "content": query
+                        }
+                    ],
+                    "temperature": 0.2,
+                    "max_tokens": 1500
+                }
+            )
+            response.raise_for_status()
             
-            Focus on:
-            1. Preferred communication style (direct vs indirect)
-            2. Level of medical detail patients expect
-            3. Role of family in discussions
-            4. Addressing common misconceptions
-            5. Building trust and credibility
-            6. Cultural sensitivities to avoid
-            7. Effective persuasion techniques in Greek culture
-            """
+            result = response.json()
+            content = result["choices"][0]["message"]["content"]
             
-            async with httpx.AsyncClient(timeout=900.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=self.headers,
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are an expert in Greek healthcare communication and patient relations."
-                            },
-                            {
-                                "role": "user",
-                                "content": query
-                            }
-                        ],
-                        "temperature": 0.2,
-                        "max_tokens": 1500
-                    }
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                content = result["choices"][0]["message"]["content"]
-                
-                return {
-                    'communication_strategies': content,
-                    'target_audience': target_audience,
-                    'topic': topic
-                }
-                
-        except Exception as e:
-            logger.error(f"Error researching patient communication: {e}")
-            raise
+            return {
+                'communication_strategies': content,
+                'target_audience': target_audience,
+                'topic': topic
+            }
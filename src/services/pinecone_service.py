@@ -3,36 +3,67 @@ Pinecone service for medical research and RAG validation.
 Handles vector search against medical knowledge base.
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 from typing import List  # Separate import for Railway compatibility
+
+import orjson
 from pinecone import Pinecone
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from ..config import settings
+from ..config import get_settings
+from ..utils.errors import log_and_reraise
 
 logger = logging.getLogger(__name__)
 
+# Search results reused for identical (embedding, top_k, filter) queries
+QUERY_CACHE_SIZE = 512
+QUERY_CACHE_TTL_SECONDS = 3600.0
+
 
 class PineconeService:
     """Service for interacting with Pinecone vector database."""
     
     def __init__(self):
         """Initialize Pinecone client and index."""
+        settings = get_settings()
         self.client = Pinecone(api_key=settings.pinecone_api_key)
         self.index = None
+        # Bounds concurrent queries (each also occupies a worker thread)
+        self._semaphore = asyncio.Semaphore(settings.pinecone_max_concurrency)
+        # query key -> (expires_at, results); and searches currently running per key
+        self._query_cache: "OrderedDict[str, Tuple[float, Tuple[Dict[str, Any], ...]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
         self._initialize_index()
     
+    @log_and_reraise("Failed to initialize Pinecone index")
     def _initialize_index(self):
         """Initialize the Pinecone index."""
-        try:
+        settings = get_settings()
+        # The handle lives as long as the service singleton; with a known host no
+        # control-plane round-trip is needed to resolve it
+        if settings.pinecone_index_host:
+            self.index = self.client.Index(host=settings.pinecone_index_host)
+        else:
             self.index = self.client.Index(settings.pinecone_index_name)
-            logger.info(f"Connected to Pinecone index: {settings.pinecone_index_name}")
-        except Exception as e:
-            logger.error(f"Failed to initialize Pinecone index: {e}")
-            raise
+        logger.info("Connected to Pinecone index: %s", settings.pinecone_index_name)
+    
+    @staticmethod
+    def _query_key(
+        query_embedding: List[float],
+        top_k: int,
+        filter_metadata: Optional[Dict[str, Any]]
+    ) -> str:
+        """Hash a search's inputs; float32 bytes keep the key cheap for long vectors."""
+        digest = hashlib.blake2b(array("f", query_embedding).tobytes(), digest_size=16)
+        digest.update(orjson.dumps([top_k, filter_metadata], option=orjson.OPT_SORT_KEYS))
+        return digest.hexdigest()
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     async def search_medical_knowledge(
         self,
         query_embedding: List[float],
@@ -48,39 +79,72 @@ class PineconeService:
             filter_metadata: Optional metadata filters
             
         Returns:
-            List of matching documents with metadata
+            List of matching documents with metadata; the dicts are shared, do not mutate them
         """
-        try:
-            if not self.index:
-                raise ValueError("Pinecone index not initialized")
-            
-            # Perform vector search
-            results = self.index.query(
+        key = self._query_key(query_embedding, top_k, filter_metadata)
+        cached = self._query_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            self._query_cache.move_to_end(key)
+            return list(cached[1])
+        
+        # Identical searches arriving together share one Pinecone query
+        search = self._inflight.get(key)
+        if search is None:
+            search = asyncio.ensure_future(self._query(query_embedding, top_k, filter_metadata))
+            self._inflight[key] = search
+            search.add_done_callback(lambda done: self._finish_query(key, done))
+        
+        # A cancelled caller must not cancel the search for the others waiting on it
+        return list(await asyncio.shield(search))
+    
+    def _finish_query(self, key: str, search: asyncio.Future) -> None:
+        """Forget the finished search and cache its results if it succeeded."""
+        self._inflight.pop(key, None)
+        if search.cancelled() or search.exception() is not None:
+            return
+        
+        self._query_cache[key] = (time.monotonic() + QUERY_CACHE_TTL_SECONDS, tuple(search.result()))
+        self._query_cache.move_to_end(key)
+        while len(self._query_cache) > QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+    
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    @log_and_reraise("Error searching medical knowledge")
+    async def _query(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        filter_metadata: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Run the vector search against the index."""
+        if not self.index:
+            raise ValueError("Pinecone index not initialized")
+        
+        # Perform vector search (the Pinecone client is synchronous)
+        async with self._semaphore:
+            results = await asyncio.to_thread(
+                self.index.query,
                 vector=query_embedding,
                 top_k=top_k,
                 filter=filter_metadata,
                 include_metadata=True,
                 include_values=False
             )
-            
-            # Extract and format results
-            formatted_results = []
-            for match in results.matches:
-                formatted_results.append({
-                    'id': match.id,
-                    'score': float(match.score),
-                    'content': match.metadata.get('content', ''),
-                    'source': match.metadata.get('source', 'Unknown'),
-                    'type': match.metadata.get('type', 'medical'),
-                    'metadata': match.metadata
-                })
-            
-            logger.info(f"Retrieved {len(formatted_results)} medical knowledge results")
-            return formatted_results
-            
-        except Exception as e:
-            logger.error(f"Error searching medical knowledge: {e}")
-            raise
+        
+        # Extract and format results
+        formatted_results = []
+        for match in results.matches:
+            formatted_results.append({
+                'id': match.id,
+                'score': float(match.score),
+                'content': match.metadata.get('content', ''),
+                'source': match.metadata.get('source', 'Unknown'),
+                'type': match.metadata.get('type', 'medical'),
+                'metadata': match.metadata
+            })
+        
+        logger.info("Retrieved %s medical knowledge results", len(formatted_results))
+        return formatted_results
     
     async def search_by_topic(
         self,
@@ -139,9 +203,10 @@ class PineconeService:
             }
             
         except Exception as e:
-            logger.error(f"Error searching by topic '{topic}': {e}")
+            logger.error("Error searching by topic '%s': %s", topic, e)
             raise
     
+    @log_and_reraise("Error validating medical accuracy")
     async def validate_medical_accuracy(
         self,
         content: str,
@@ -159,35 +224,30 @@ class PineconeService:
         Returns:
             Validation results with accuracy score
         """
-        try:
-            # Search for similar medical content
-            results = await self.search_medical_knowledge(
-                query_embedding=content_embedding,
-                top_k=10,
-                filter_metadata={"type": {"$in": ["guideline", "study", "fact"]}}
-            )
-            
-            # Calculate accuracy metrics
-            high_similarity_matches = [r for r in results if r['score'] > threshold]
-            accuracy_score = min(100, len(high_similarity_matches) * 10)  # Max 100
-            
-            # Check for contradictions
-            contradictions = []
-            for result in results:
-                if result['score'] > 0.6 and self._check_contradiction(content, result['content']):
-                    contradictions.append(result)
-            
-            return {
-                'accuracy_score': accuracy_score,
-                'supporting_evidence': high_similarity_matches,
-                'contradictions': contradictions,
-                'validation_passed': accuracy_score >= 70 and len(contradictions) == 0,
-                'recommendations': self._generate_accuracy_recommendations(results)
-            }
-            
-        except Exception as e:
-            logger.error(f"Error validating medical accuracy: {e}")
-            raise
+        # Search for similar medical content
+        results = await self.search_medical_knowledge(
+            query_embedding=content_embedding,
+            top_k=10,
+            filter_metadata={"type": {"$in": ["guideline", "study", "fact"]}}
+        )
+        
+        # Calculate accuracy metrics
+        high_similarity_matches = [r for r in results if r['score'] > threshold]
+        accuracy_score = min(100, len(high_similarity_matches) * 10)  # Max 100
+        
+        # Check for contradictions
+        contradictions = []
+        for result in results:
+            if result['score'] > 0.6 and self._check_contradiction(content, result['content']):
+                contradictions.append(result)
+        
+        return {
+            'accuracy_score': accuracy_score,
+            'supporting_evidence': high_similarity_matches,
+            'contradictions': contradictions,
+            'validation_passed': accuracy_score >= 70 and len(contradictions) == 0,
+            'recommendations': self._generate_accuracy_recommendations(results)
+        }
     
     def _check_contradiction(self, content: str, reference: str) -> bool:
         """Check if content contradicts reference material."""
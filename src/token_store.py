@@ -0,0 +1,107 @@
+"""
+On-disk cache for Google OAuth tokens.
+Lets a freshly started process reuse a still-valid access token instead of refreshing.
+"""
+
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # Windows has no flock; the file is then read and written without a lock
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATH = Path.home() / ".cache" / "chloros" / "google_token.json"
+
+# Minimum remaining lifetime for warmup() to report the cached token as usable
+WARMUP_MIN_TTL_SECONDS = 300
+
+
+@contextmanager
+def _locked(f, exclusive: bool):
+    """Hold an flock on the open file, where the platform supports it."""
+    if fcntl is None:
+        yield
+        return
+
+    fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    try:
+        yield
+    finally:
+        fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _read() -> Optional[Dict[str, Any]]:
+    """Read the token file under a shared lock."""
+    try:
+        with open(TOKEN_PATH, "r", encoding="utf-8") as f, _locked(f, exclusive=False):
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable token cache %s: %s", TOKEN_PATH, e)
+        return None
+
+
+def load(refresh_token: str) -> Optional[Tuple[str, float]]:
+    """
+    Load the cached access token issued for this refresh token.
+
+    Args:
+        refresh_token: Refresh token the cached access token must belong to
+
+    Returns:
+        Tuple of (access_token, expires_at) with expires_at as a time.time() value,
+        or None if nothing usable is cached
+    """
+    data = _read()
+    if not data or data.get("refresh_token") != refresh_token:
+        return None
+    if data.get("expires_at", 0) <= time.time():
+        return None
+    return data["access_token"], data["expires_at"]
+
+
+def save(access_token: str, expires_at: float, refresh_token: str) -> None:
+    """
+    Persist the token with mode 0600, skipping the write if nothing changed.
+
+    Args:
+        access_token: Current access token
+        expires_at: Expiry as a time.time() value
+        refresh_token: Refresh token the access token was issued for
+    """
+    data = {
+        "access_token": access_token,
+        "expires_at": expires_at,
+        "refresh_token": refresh_token,
+    }
+    if _read() == data:
+        return
+
+    try:
+        TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(TOKEN_PATH, os.O_CREAT | os.O_WRONLY, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f, _locked(f, exclusive=True):
+            f.truncate()
+            json.dump(data, f)
+            f.flush()
+    except OSError as e:
+        # The cache is an optimization only; never fail the caller over it
+        logger.warning("Could not write token cache %s: %s", TOKEN_PATH, e)
+
+
+def warmup() -> Optional[str]:
+    """Return the cached access token if it is valid for at least a few more minutes."""
+    data = _read()
+    if not data or data.get("expires_at", 0) - time.time() <= WARMUP_MIN_TTL_SECONDS:
+        return None
+    return data.get("access_token")
@@ -1,5 +1,7 @@
 """Utility functions and helpers."""
 
+from .embedding_cache import EmbeddingCache
+from .research_cache import ResearchCache
 from .scoring_engine import ScoringEngine
 
-__all__ = ["ScoringEngine"]
+__all__ = ["EmbeddingCache", "ResearchCache", "ScoringEngine"]
@@ -0,0 +1,119 @@
+"""
+Process-wide cache of text embeddings.
+An embedding only depends on the model, its dimensions and the text, so repeats skip the OpenAI call.
+"""
+
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from typing import List  # Separate import for Railway compatibility
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """LRU cache of embedding vectors keyed by a hash of model, dimensions and text."""
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 86400.0):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum cached vectors before the least recently used is evicted
+            ttl_seconds: How long a vector is reused; bounds staleness if the model is updated in place
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        # key -> (expires_at, embedding)
+        self._entries: "OrderedDict[str, Tuple[float, List[float]]]" = OrderedDict()
+
+    @staticmethod
+    def _key(model: str, dimensions: int, text: str) -> str:
+        """Hash the embedding inputs into a fixed-size key."""
+        return hashlib.sha256(f"{model}\n{dimensions}\n{text}".encode("utf-8")).hexdigest()
+
+    def get(self, model: str, dimensions: int, text: str) -> Optional[List[float]]:
+        """Return the cached embedding for this text, if still valid."""
+        key = self._key(model, dimensions, text)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, model: str, dimensions: int, text: str, embedding: List[float]) -> None:
+        """Store the embedding of this text."""
+        key = self._key(model, dimensions, text)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, embedding)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def dump(self, path: Path) -> None:
+        """
+        Write the unexpired vectors to disk so a restarted server skips re-embedding them.
+
+        Args:
+            path: Destination file, replaced atomically
+        """
+        now, wall_now = time.monotonic(), time.time()
+        entries = [
+            [key, wall_now + (expires_at - now), embedding]
+            for key, (expires_at, embedding) in self._entries.items()
+            if expires_at > now
+        ]
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(orjson.dumps(entries))
+            os.replace(tmp_path, path)
+            logger.info("Saved %s cached embeddings to %s", len(entries), path)
+        except (OSError, TypeError) as e:
+            logger.warning("Could not write embedding cache %s: %s", path, e)
+
+    def load(self, path: Path) -> None:
+        """
+        Restore vectors written by dump(), skipping any that expired meanwhile.
+
+        Args:
+            path: File written by dump()
+        """
+        try:
+            entries = orjson.loads(path.read_bytes())
+        except FileNotFoundError:
+            return
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning("Ignoring unreadable embedding cache %s: %s", path, e)
+            return
+
+        now, wall_now = time.monotonic(), time.time()
+        for key, wall_expires_at, embedding in entries:
+            if wall_expires_at > wall_now:
+                self._entries[key] = (now + (wall_expires_at - wall_now), embedding)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        logger.info("Loaded %s cached embeddings from %s", len(self._entries), path)
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count and hit/miss counters for the health endpoint."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Shared by every OpenAIService instance and reported by /health
+embedding_cache = EmbeddingCache()
@@ -0,0 +1,76 @@
+"""
+Shared error handling for service calls.
+Replaces the repeated log-then-raise try/except blocks around API methods.
+"""
+
+import functools
+import inspect
+import logging
+from typing import Any, Callable, TypeVar
+
+from tenacity import RetryCallState
+from tenacity.wait import wait_base
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def log_and_reraise(message: str) -> Callable[[F], F]:
+    """
+    Log any exception raised by the decorated function, then re-raise it.
+    
+    Args:
+        message: Prefix of the error log line, e.g. "Error creating embeddings"
+        
+    Returns:
+        Decorator for sync or async functions; records go to the function's module logger
+    """
+    def decorator(func: F) -> F:
+        logger = logging.getLogger(func.__module__)
+        
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    logger.error("%s: %s", message, e)
+                    raise
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                logger.error("%s: %s", message, e)
+                raise
+        return wrapper
+    
+    return decorator
+
+
+class wait_retry_after(wait_base):
+    """
+    Tenacity wait that honours a rate-limited response's Retry-After header.
+    
+    Works for httpx.HTTPStatusError and the OpenAI SDK's API errors, which both
+    carry the response; anything else (or an HTTP-date Retry-After) uses the fallback.
+    """
+    
+    def __init__(self, fallback: wait_base, max_wait: float = 60.0):
+        """
+        Args:
+            fallback: Wait strategy used when the provider gives no usable hint
+            max_wait: Upper bound in seconds on a provider-requested wait
+        """
+        self.fallback = fallback
+        self.max_wait = max_wait
+    
+    def __call__(self, retry_state: RetryCallState) -> float:
+        exception = retry_state.outcome.exception() if retry_state.outcome else None
+        response = getattr(exception, "response", None)
+        retry_after = getattr(response, "headers", {}).get("retry-after")
+        try:
+            return min(max(float(retry_after), 0.0), self.max_wait)
+        except (TypeError, ValueError):
+            return self.fallback(retry_state)
@@ -0,0 +1,154 @@
+"""
+Two-tier cache for medical research results.
+Exact query matches skip the embedding and Pinecone calls; near-identical queries skip Pinecone.
+"""
+
+import hashlib
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from typing import List  # Separate import for Railway compatibility
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Where the server persists the cache between restarts
+CACHE_DIR = Path.home() / ".cache" / "chloros"
+
+
+class ResearchCache:
+    """LRU cache of research results keyed by query text and by query embedding."""
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 3600.0,
+        similarity_threshold: float = 0.95
+    ):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum cached queries before the least recently used is evicted
+            ttl_seconds: How long a cached result stays valid
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        # key -> (expires_at, normalized embedding or None, result)
+        self._entries: "OrderedDict[str, Tuple[float, Optional[List[float]], Dict[str, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def _key(query: str) -> str:
+        """Hash the query text into a fixed-size key."""
+        return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> List[float]:
+        """Scale the embedding to unit length so a dot product is the cosine similarity."""
+        norm = math.sqrt(sum(value * value for value in embedding))
+        if norm == 0:
+            return list(embedding)
+        return [value / norm for value in embedding]
+
+    def get_exact(self, query: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for exactly this query text, if still valid."""
+        key = self._key(query)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return entry[2]
+
+    def get_similar(self, embedding: List[float]) -> Optional[Dict[str, Any]]:
+        """Return the result of the most similar cached query above the threshold."""
+        now = time.monotonic()
+        query = self._normalize(embedding)
+
+        best_key, best_score = None, self.similarity_threshold
+        for key, (expires_at, cached, _) in self._entries.items():
+            if expires_at <= now or cached is None or len(cached) != len(query):
+                continue
+            score = sum(a * b for a, b in zip(query, cached))
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        if best_key is None:
+            return None
+
+        logger.debug("Semantic research cache hit (similarity %.3f)", best_score)
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key][2]
+
+    def put(self, query: str, embedding: Optional[List[float]], result: Dict[str, Any]) -> None:
+        """Store a result under its query text and, when given, its embedding."""
+        key = self._key(query)
+        normalized = self._normalize(embedding) if embedding is not None else None
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, normalized, result)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        self._entries.clear()
+
+    def dump(self, path: Path) -> None:
+        """
+        Write the unexpired entries to disk so a restarted server starts warm.
+
+        Args:
+            path: Destination file, replaced atomically
+        """
+        now, wall_now = time.monotonic(), time.time()
+        # Monotonic deadlines mean nothing to the next process; store wall-clock expiry
+        entries = [
+            [key, wall_now + (expires_at - now), embedding, result]
+            for key, (expires_at, embedding, result) in self._entries.items()
+            if expires_at > now
+        ]
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(orjson.dumps(entries))
+            os.replace(tmp_path, path)
+            logger.info("Saved %s research cache entries to %s", len(entries), path)
+        except (OSError, TypeError) as e:
+            # The cache is an optimization only; never fail shutdown over it
+            logger.warning("Could not write research cache %s: %s", path, e)
+
+    def load(self, path: Path) -> None:
+        """
+        Restore entries written by dump(), skipping any that expired meanwhile.
+
+        Args:
+            path: File written by dump()
+        """
+        try:
+            entries = orjson.loads(path.read_bytes())
+        except FileNotFoundError:
+            return
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning("Ignoring unreadable research cache %s: %s", path, e)
+            return
+
+        now, wall_now = time.monotonic(), time.time()
+        for key, wall_expires_at, embedding, result in entries:
+            if wall_expires_at > wall_now:
+                self._entries[key] = (now + (wall_expires_at - wall_now), embedding, result)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        logger.info("Loaded %s research cache entries from %s", len(self._entries), path)
@@ -5,12 +5,61 @@ Implements the 4-category scoring system with critical violation detection.
 
 import logging
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from typing import List  # Separate import for Railway compatibility
 from ..models.evaluation import Evaluation, ScoreBreakdown
+from .errors import log_and_reraise
 
 logger = logging.getLogger(__name__)
 
+# Patterns are compiled once at import and shared by every evaluation
+_MARKDOWN_SYNTAX_RE = re.compile(r'[#*_`\[\]()]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_SUCCESS_RANGE_RE = re.compile(r'\d{1,2}-\d{1,2}%')
+_ABSOLUTE_SUCCESS_RE = re.compile(r'\d{1,2}% επιτυχία')
+_H1_RE = re.compile(r'^#[^#]', re.MULTILINE)
+_H2_RE = re.compile(r'^##[^#]', re.MULTILINE)
+_BOLD_RE = re.compile(r'\*\*[^*]+\*\*')
+_LIST_ITEM_RE = re.compile(r'^[-*+]\s', re.MULTILINE)
+
+# Phrase lists checked against the lower-cased article
+_THIRD_PERSON_PHRASES = (
+    "ο δρ", "η θεραπεία", "η επέμβαση", "το πρόβλημα",
+    "εφαρμόζει", "χρησιμοποιεί", "συνιστά", "περιλαμβάνει"
+)
+_FIRST_PERSON_PHRASES = (
+    " εγώ ", " με ", " μου ", " μας ", "πιστεύω", "νομίζω",
+    "συνιστώ", "προτείνω", "χρησιμοποιώ"
+)
+_PROFESSIONAL_PHRASES = (
+    "ιατρικός", "κλινικός", "θεραπευτικός", "χειρουργικός",
+    "επιστημονικός", "αποτελεσματικός"
+)
+_CREDENTIAL_PHRASES = ("vcu medical center", "leeds hospital")
+# The first three are critical; the rest only cost voice points
+_EMOTIONAL_STORY_PHRASES = ("προσωπικές ιστορίες", "ιστορία ασθενούς", "συναισθήματα")
+_EMOTIONAL_PHRASES = _EMOTIONAL_STORY_PHRASES + ("φόβος", "ανησυχία", "στενοχώρια")
+_VARIABILITY_PHRASES = ("μεταβλητότητα", "εξαρτάται", "διαφέρει", "ποικίλλει")
+_MEDICAL_VARIABILITY_PHRASES = _VARIABILITY_PHRASES + ("ατομικές διαφορές", "περίπτωση")
+_CONTRADICTION_PAIRS = (
+    ("αυξάνει", "μειώνει"), ("υψηλός", "χαμηλός"),
+    ("αποτελεσματικός", "αναποτελεσματικός"),
+    ("ασφαλής", "επικίνδυνος"), ("συνιστάται", "δεν συνιστάται")
+)
+_EXPECTED_SECTION_FLOW = ("ανατομία", "συμπτώματα", "διάγνωση", "θεραπεία", "αποκατάσταση")
+
+# Each distinct phrase is counted once per evaluation, however many checks use it
+_TRACKED_PHRASES = frozenset(
+    _THIRD_PERSON_PHRASES + _FIRST_PERSON_PHRASES + _PROFESSIONAL_PHRASES
+    + _CREDENTIAL_PHRASES + _EMOTIONAL_PHRASES + _VARIABILITY_PHRASES
+)
+
+# Medical terms that should be followed by a plain-language explanation in parentheses
+_EXPLAINED_TERM_RES = {
+    term: re.compile(f"{term}.*?\\([^)]+\\)")
+    for term in ("χόνδρος", "σύνδεσμος", "μηνίσκος", "αρθρίτιδα")
+}
+
 
 class ScoringEngine:
     """Engine for scoring article quality across multiple dimensions."""
@@ -26,6 +75,7 @@ class ScoringEngine:
         self.pass_threshold = 80
         self.word_count_fail_threshold = -15.0  # -15%
     
+    @log_and_reraise("Error evaluating article")
     def evaluate_article(
         self,
         article_content: str,
@@ -45,73 +95,71 @@ class ScoringEngine:
         Returns:
             Complete evaluation with scores and recommendations
         """
-        try:
-            # Calculate actual word count
-            actual_word_count = self._count_words(article_content)
-            word_count_deviation = self._calculate_word_count_deviation(
-                actual_word_count, target_word_count
-            )
-            
-            # Evaluate each category
-            voice_score = self._evaluate_voice_consistency(article_content)
-            structure_score = self._evaluate_structure_quality(article_content)
-            medical_score = self._evaluate_medical_accuracy(article_content)
-            seo_score = self._evaluate_seo_technical(article_content, target_word_count)
-            
-            # Create score breakdown
-            score_breakdown = ScoreBreakdown(
-                voice_consistency=voice_score,
-                structure_quality=structure_score,
-                medical_accuracy=medical_score,
-                seo_technical=seo_score
-            )
-            
-            total_score = score_breakdown.calculate_total()
-            
-            # Detect critical issues
-            critical_issues = self._detect_critical_issues(
-                article_content, word_count_deviation
-            )
-            
-            # Apply critical penalties
-            total_score = self._apply_critical_penalties(total_score, critical_issues)
-            
-            # Generate improvement recommendations
-            improvements_needed = self._generate_improvements(
-                article_content, score_breakdown, critical_issues
-            )
-            
-            # Create evaluation object
-            evaluation = Evaluation(
-                total_score=total_score,
-                score_breakdown=score_breakdown,
-                word_count_actual=actual_word_count,
-                word_count_target=target_word_count,
-                word_count_deviation_percent=word_count_deviation,
-                critical_issues=critical_issues,
-                improvements_needed=improvements_needed,
-                passes_quality_gate=False,  # Will be calculated
-                retry_count=retry_count
-            )
-            
-            # Determine pass status
-            evaluation.determine_pass_status(
-                self.pass_threshold, self.word_count_fail_threshold
-            )
-            
-            logger.info(f"Article evaluation completed: {total_score}/100")
-            return evaluation
-            
-        except Exception as e:
-            logger.error(f"Error evaluating article: {e}")
-            raise
+        # Calculate actual word count
+        actual_word_count = self._count_words(article_content)
+        word_count_deviation = self._calculate_word_count_deviation(
+            actual_word_count, target_word_count
+        )
+        
+        # Lower-case once; the phrase checks below all scan the same text
+        content_lower = article_content.lower()
+        phrase_counts = {phrase: content_lower.count(phrase) for phrase in _TRACKED_PHRASES}
+        
+        # Evaluate each category
+        voice_score = self._evaluate_voice_consistency(phrase_counts)
+        structure_score = self._evaluate_structure_quality(article_content)
+        medical_score = self._evaluate_medical_accuracy(article_content, content_lower)
+        seo_score = self._evaluate_seo_technical(article_content, target_word_count, actual_word_count)
+        
+        # Create score breakdown; every category helper clamps to its field's range,
+        # so the models below are built without re-running pydantic validation
+        score_breakdown = ScoreBreakdown.model_construct(
+            voice_consistency=voice_score,
+            structure_quality=structure_score,
+            medical_accuracy=medical_score,
+            seo_technical=seo_score
+        )
+        
+        total_score = score_breakdown.calculate_total()
+        
+        # Detect critical issues
+        critical_issues = self._detect_critical_issues(
+            phrase_counts, word_count_deviation
+        )
+        
+        # Apply critical penalties
+        total_score = self._apply_critical_penalties(total_score, critical_issues)
+        
+        # Generate improvement recommendations
+        improvements_needed = self._generate_improvements(
+            article_content, score_breakdown, critical_issues
+        )
+        
+        # Create evaluation object; the deviation is derived by the model itself and
+        # the pass status is known here, so nothing is written back afterwards
+        evaluation = Evaluation.model_construct(
+            total_score=total_score,
+            score_breakdown=score_breakdown,
+            word_count_actual=actual_word_count,
+            word_count_target=target_word_count,
+            critical_issues=critical_issues,
+            improvements_needed=improvements_needed,
+            passes_quality_gate=(
+                total_score >= self.pass_threshold
+                and word_count_deviation > self.word_count_fail_threshold
+            ),
+            retry_count=retry_count
+        )
+        
+        logger.info("Article evaluation completed: %s/100", total_score)
+        return evaluation
     
     def _count_words(self, content: str) -> int:
         """Count words in content, excluding markdown syntax."""
         # Remove markdown syntax
-        text = re.sub(r'[#*_`\[\]()]', '', content)
+        text = _MARKDOWN_SYNTAX_RE.sub('', content)
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         # Split and count
         words = text.strip().split()
         return len(words)
@@ -122,43 +170,30 @@ class ScoringEngine:
             return 0.0
         return ((actual - target) / target) * 100
     
-    def _evaluate_voice_consistency(self, content: str) -> int:
-        """Evaluate voice consistency (0-25 points)."""
+    def _evaluate_voice_consistency(self, phrase_counts: Dict[str, int]) -> int:
+        """Evaluate voice consistency (0-25 points) from the article's phrase counts."""
         score = 25  # Start with full points
-        content_lower = content.lower()
         
         # Check for third person usage (Γ' ενικό) - 10 points
-        third_person_indicators = [
-            "ο δρ", "η θεραπεία", "η επέμβαση", "το πρόβλημα",
-            "εφαρμόζει", "χρησιμοποιεί", "συνιστά", "περιλαμβάνει"
-        ]
-        third_person_count = sum(content_lower.count(indicator) for indicator in third_person_indicators)
+        third_person_count = sum(phrase_counts[indicator] for indicator in _THIRD_PERSON_PHRASES)
         
         if third_person_count < 3:
             score -= 5  # Insufficient third person usage
         
         # Check for first person violations (Α' ενικό) - CRITICAL
-        first_person_violations = [
-            " εγώ ", " με ", " μου ", " μας ", "πιστεύω", "νομίζω",
-            "συνιστώ", "προτείνω", "χρησιμοποιώ"
-        ]
-        first_person_count = sum(content_lower.count(violation) for violation in first_person_violations)
+        first_person_count = sum(phrase_counts[violation] for violation in _FIRST_PERSON_PHRASES)
         
         if first_person_count > 0:
             score = max(0, score - 10)  # Major penalty for first person
         
         # Check for professional tone - 8 points
-        professional_indicators = [
-            "ιατρικός", "κλινικός", "θεραπευτικός", "χειρουργικός",
-            "επιστημονικός", "αποτελεσματικός"
-        ]
-        professional_count = sum(content_lower.count(indicator) for indicator in professional_indicators)
+        professional_count = sum(phrase_counts[indicator] for indicator in _PROFESSIONAL_PHRASES)
         
         if professional_count < 2:
             score = max(0, score - 4)  # Insufficient professional tone
         
         # Check for credentials mentioned naturally once - 4 points
-        credentials_mentions = content_lower.count("vcu medical center") + content_lower.count("leeds hospital")
+        credentials_mentions = sum(phrase_counts[credential] for credential in _CREDENTIAL_PHRASES)
         
         if credentials_mentions == 0:
             score = max(0, score - 4)  # No credentials mentioned
@@ -166,11 +201,7 @@ class ScoringEngine:
             score = max(0, score - 2)  # Over-mentioned credentials
         
         # Check for absence of emotional stories - 3 points
-        emotional_indicators = [
-            "προσωπικές ιστορίες", "ιστορία ασθενούς", "συναισθήματα",
-            "φόβος", "ανησυχία", "στενοχώρια"
-        ]
-        emotional_count = sum(content_lower.count(indicator) for indicator in emotional_indicators)
+        emotional_count = sum(phrase_counts[indicator] for indicator in _EMOTIONAL_PHRASES)
         
         if emotional_count > 0:
             score = max(0, score - 3)  # Penalty for emotional content
@@ -185,8 +216,7 @@ class ScoringEngine:
         sections = self._extract_sections(content)
         
         # Check for logical flow - 10 points
-        expected_flow = ["ανατομία", "συμπτώματα", "διάγνωση", "θεραπεία", "αποκατάσταση"]
-        flow_score = self._check_logical_flow(sections, expected_flow)
+        flow_score = self._check_logical_flow(sections, _EXPECTED_SECTION_FLOW)
         score = max(0, score - (10 - flow_score))
         
         # Check for repetitions - 8 points
@@ -203,42 +233,37 @@ class ScoringEngine:
         
         return max(0, min(25, score))
     
-    def _evaluate_medical_accuracy(self, content: str) -> int:
+    def _evaluate_medical_accuracy(self, content: str, content_lower: str) -> int:
         """Evaluate medical accuracy (0-30 points)."""
         score = 30  # Start with full points
-        content_lower = content.lower()
         
         # Check for success rate ranges (75-85%) - 10 points
-        range_patterns = re.findall(r'\d{1,2}-\d{1,2}%', content)
+        range_patterns = _SUCCESS_RANGE_RE.findall(content)
         if len(range_patterns) < 1:
             score = max(0, score - 5)  # No ranges found
         
         # Check for absolute claims (should be avoided) - penalty
-        absolute_patterns = re.findall(r'\d{1,2}% επιτυχία', content_lower)
+        absolute_patterns = _ABSOLUTE_SUCCESS_RE.findall(content_lower)
         if len(absolute_patterns) > 0:
             score = max(0, score - 3)  # Penalty for absolute claims
         
         # Check for variability disclaimers - 8 points
-        variability_indicators = [
-            "μεταβλητότητα", "εξαρτάται", "διαφέρει", "ποικίλλει",
-            "ατομικές διαφορές", "περίπτωση"
-        ]
-        variability_count = sum(content_lower.count(indicator) for indicator in variability_indicators)
+        variability_count = sum(content_lower.count(indicator) for indicator in _MEDICAL_VARIABILITY_PHRASES)
         
         if variability_count < 2:
             score = max(0, score - 4)  # Insufficient variability mentions
         
         # Check for contradictions - 8 points
-        contradiction_penalty = self._check_medical_contradictions(content)
+        contradiction_penalty = self._check_medical_contradictions(content_lower)
         score = max(0, score - contradiction_penalty)
         
         # Check for Greek terms + plain explanations - 4 points
-        explanation_penalty = self._check_medical_explanations(content)
+        explanation_penalty = self._check_medical_explanations(content_lower)
         score = max(0, score - explanation_penalty)
         
         return max(0, min(30, score))
     
-    def _evaluate_seo_technical(self, content: str, target_word_count: int) -> int:
+    def _evaluate_seo_technical(self, content: str, target_word_count: int, actual_words: int) -> int:
         """Evaluate SEO and technical aspects (0-20 points)."""
         score = 20  # Start with full points
         
@@ -256,7 +281,6 @@ class ScoringEngine:
         score = max(0, score - markdown_penalty)
         
         # Check word count accuracy - 6 points
-        actual_words = self._count_words(content)
         word_count_penalty = self._calculate_word_count_penalty(actual_words, target_word_count)
         score = max(0, score - word_count_penalty)
         
@@ -274,7 +298,7 @@ class ScoringEngine:
         
         return sections
     
-    def _check_logical_flow(self, sections: List[str], expected_flow: List[str]) -> int:
+    def _check_logical_flow(self, sections: List[str], expected_flow: Tuple[str, ...]) -> int:
         """Check logical flow of sections (0-10 points)."""
         score = 10
         section_indices = {}
@@ -336,37 +360,28 @@ class ScoringEngine:
         
         return min(3, penalty)
     
-    def _check_medical_contradictions(self, content: str) -> int:
+    def _check_medical_contradictions(self, content_lower: str) -> int:
         """Check for medical contradictions (0-8 penalty points)."""
-        content_lower = content.lower()
-        contradictions = [
-            ("αυξάνει", "μειώνει"), ("υψηλός", "χαμηλός"), 
-            ("αποτελεσματικός", "αναποτελεσματικός"),
-            ("ασφαλής", "επικίνδυνος"), ("συνιστάται", "δεν συνιστάται")
-        ]
-        
         penalty = 0
-        for positive, negative in contradictions:
+        for positive, negative in _CONTRADICTION_PAIRS:
             if positive in content_lower and negative in content_lower:
                 penalty += 2
         
         return min(8, penalty)
     
-    def _check_medical_explanations(self, content: str) -> int:
+    def _check_medical_explanations(self, content_lower: str) -> int:
         """Check for proper medical term explanations (0-4 penalty points)."""
         # Look for medical terms with explanations in parentheses
-        medical_terms = ["χόνδρος", "σύνδεσμος", "μηνίσκος", "αρθρίτιδα"]
         explained_terms = 0
+        total_medical_terms = 0
         
-        for term in medical_terms:
-            if term in content.lower():
+        for term, pattern in _EXPLAINED_TERM_RES.items():
+            if term in content_lower:
+                total_medical_terms += 1
                 # Look for explanation pattern: term (explanation)
-                pattern = f"{term}.*?\\([^)]+\\)"
-                if re.search(pattern, content.lower()):
+                if pattern.search(content_lower):
                     explained_terms += 1
         
-        total_medical_terms = sum(1 for term in medical_terms if term in content.lower())
-        
         if total_medical_terms > 0:
             explanation_ratio = explained_terms / total_medical_terms
             if explanation_ratio < 0.5:  # Less than 50% explained
@@ -410,18 +425,18 @@ class ScoringEngine:
         penalty = 0
         
         # Check for proper headers
-        if not re.search(r'^#[^#]', content, re.MULTILINE):
+        if not _H1_RE.search(content):
             penalty += 1  # No H1
         
-        if not re.search(r'^##[^#]', content, re.MULTILINE):
+        if not _H2_RE.search(content):
             penalty += 1  # No H2s
         
         # Check for bold text
-        if not re.search(r'\*\*[^*]+\*\*', content):
+        if not _BOLD_RE.search(content):
             penalty += 1  # No bold text
         
         # Check for lists
-        if not re.search(r'^[-*+]\s', content, re.MULTILINE):
+        if not _LIST_ITEM_RE.search(content):
             penalty += 1  # No lists
         
         return penalty
@@ -444,31 +459,20 @@ class ScoringEngine:
         else:  # More than 20% off
             return 6
     
-    def _detect_critical_issues(self, content: str, word_count_deviation: float) -> List[str]:
+    def _detect_critical_issues(self, phrase_counts: Dict[str, int], word_count_deviation: float) -> List[str]:
         """Detect critical issues that warrant penalties or automatic failure."""
         issues = []
-        content_lower = content.lower()
         
         # First person usage (Α' ενικό) - CRITICAL
-        first_person_violations = [
-            " εγώ ", " με ", " μου ", " μας ", "πιστεύω", "νομίζω",
-            "συνιστώ", "προτείνω", "χρησιμοποιώ"
-        ]
-        if any(violation in content_lower for violation in first_person_violations):
+        if any(phrase_counts[violation] for violation in _FIRST_PERSON_PHRASES):
             issues.append("Α' ενικό usage detected (forbidden voice)")
         
         # Emotional stories - CRITICAL
-        emotional_indicators = [
-            "προσωπικές ιστορίες", "ιστορία ασθενούς", "συναισθήματα"
-        ]
-        if any(indicator in content_lower for indicator in emotional_indicators):
+        if any(phrase_counts[indicator] for indicator in _EMOTIONAL_STORY_PHRASES):
             issues.append("Emotional stories detected (forbidden pattern)")
         
         # Missing variability disclaimers - CRITICAL
-        variability_indicators = [
-            "μεταβλητότητα", "εξαρτάται", "διαφέρει", "ποικίλλει"
-        ]
-        if not any(indicator in content_lower for indicator in variability_indicators):
+        if not any(phrase_counts[indicator] for indicator in _VARIABILITY_PHRASES):
             issues.append("Missing variability disclaimers")
         
         # Word count below -15% - AUTOMATIC FAIL